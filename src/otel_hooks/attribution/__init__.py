@@ -13,6 +13,7 @@ Usage (from hook.py):
 from __future__ import annotations
 
 import logging
+import os
 from pathlib import Path
 
 from otel_hooks.attribution.extractor import FileOp
@@ -25,6 +26,8 @@ from otel_hooks.attribution.record import (
 
 logger = logging.getLogger(__name__)
 
+_UNSEEN = object()
+
 
 def build_file_records(ops: list[FileOp], repo_root: Path) -> list[FileRecord]:
     """Convert ordered FileOp list into agent-trace FileRecords.
@@ -33,19 +36,23 @@ def build_file_records(ops: list[FileOp], repo_root: Path) -> list[FileRecord]:
     - Falls back to reading current file on disk for edit-only files.
     - Files outside repo_root are silently skipped.
     """
-    # Group ops by file, preserving first-seen order
-    file_ops: dict[Path, list[FileOp]] = {}
+    # Group in-repo ops by file, preserving first-seen order. Each distinct path
+    # is classified once; out-of-repo paths map to None and are never grouped.
+    root = str(repo_root)
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    file_ops: dict[Path, tuple[str, list[FileOp]] | None] = {}
     for op in ops:
-        file_ops.setdefault(op.abs_path, []).append(op)
+        entry = file_ops.get(op.abs_path, _UNSEEN)
+        if entry is _UNSEEN:
+            entry = file_ops[op.abs_path] = _classify(op.abs_path, repo_root, prefix)
+        if entry is not None:
+            entry[1].append(op)
 
     records: list[FileRecord] = []
-    for abs_path, path_ops in file_ops.items():
-        try:
-            rel_path = abs_path.relative_to(repo_root).as_posix()
-        except ValueError:
-            logger.debug("attribution: %s outside repo root %s; skipping", abs_path, repo_root)
+    for abs_path, entry in file_ops.items():
+        if entry is None:
             continue
-
+        rel_path, path_ops = entry
         line_count = _resolve_line_count(abs_path, path_ops)
         if not line_count:
             continue
@@ -69,17 +76,41 @@ def build_file_records(ops: list[FileOp], repo_root: Path) -> list[FileRecord]:
     return records
 
 
+def _classify(abs_path: Path, repo_root: Path, prefix: str) -> tuple[str, list[FileOp]] | None:
+    """Return (repo-relative posix path, empty op list) or None if outside repo_root."""
+    path_str = str(abs_path)
+    if path_str.startswith(prefix):
+        rel = path_str[len(prefix):]
+        return (rel if os.sep == "/" else rel.replace(os.sep, "/")), []
+    try:
+        # Slow path keeps relative_to semantics (e.g. case-insensitive on Windows).
+        return abs_path.relative_to(repo_root).as_posix(), []
+    except ValueError:
+        logger.debug("attribution: %s outside repo root %s; skipping", abs_path, repo_root)
+        return None
+
+
 def _resolve_line_count(abs_path: Path, ops: list[FileOp]) -> int | None:
     """Return authoritative line count: last Write > current file on disk."""
     for op in reversed(ops):
         if op.kind == "write" and op.line_count is not None:
             return op.line_count
 
-    if abs_path.exists():
-        try:
-            lines = abs_path.read_text(encoding="utf-8", errors="replace").splitlines()
-            return len(lines) or None
-        except OSError as e:
-            logger.debug("attribution: cannot read %s: %s", abs_path, e)
-
-    return None
+    # Stream the file and count newlines instead of materializing every line;
+    # a missing file is just an open() failure, no separate exists() stat.
+    count = 0
+    last = b""
+    try:
+        with abs_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                count += chunk.count(b"\n")
+                last = chunk
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.debug("attribution: cannot read %s: %s", abs_path, e)
+        return None
+
+    if last and not last.endswith(b"\n"):
+        count += 1  # unterminated final line
+    return count or None
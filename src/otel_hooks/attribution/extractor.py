@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
@@ -11,10 +13,17 @@ from otel_hooks.domain.transcript import Turn, get_content, get_model, iter_tool
 
 logger = logging.getLogger(__name__)
 
-# Tool names that perform full-file writes (line_count deterministic from content)
-_WRITE_TOOLS = frozenset({"Write", "write"})
-# Tool names that perform partial edits (exact line range requires file read)
-_EDIT_TOOLS = frozenset({"Edit", "edit", "MultiEdit", "multi_edit"})
+# Tool name → FileOp kind. "write" tools replace the whole file (line_count
+# deterministic from content); "edit" tools are partial (exact line range
+# requires a file read).
+_KIND_BY_TOOL: dict[str, str] = {
+    "Write": "write",
+    "write": "write",
+    "Edit": "edit",
+    "edit": "edit",
+    "MultiEdit": "edit",
+    "multi_edit": "edit",
+}
 
 # models.dev provider prefix by source_tool
 _MODEL_PREFIXES: dict[str, str] = {
@@ -25,7 +34,7 @@ _MODEL_PREFIXES: dict[str, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class FileOp:
     """A single AI file-write or file-edit operation within a session."""
 
@@ -35,6 +44,7 @@ class FileOp:
     line_count: int | None  # populated for "write"; None for "edit"
 
 
+@functools.lru_cache(maxsize=64)
 def normalize_model(model: str, source_tool: str) -> str:
     """Convert raw model string to models.dev convention."""
     if model in ("unknown", ""):
@@ -48,13 +58,20 @@ def normalize_model(model: str, source_tool: str) -> str:
 def extract_file_ops(turns: list[Turn], source_tool: str = "") -> list[FileOp]:
     """Scan turns for Write/Edit tool calls and return ordered FileOp list."""
     ops: list[FileOp] = []
+    # The same file is typically written/edited many times per session;
+    # canonicalize each distinct path string once.
+    resolved: dict[str, Path] = {}
     for turn in turns:
         model_raw = get_model(turn.assistant_msgs[0]) if turn.assistant_msgs else "unknown"
+        if not isinstance(model_raw, str):  # malformed transcript; keep the cache key hashable
+            model_raw = "unknown"
         model = normalize_model(model_raw, source_tool)
 
         for am in turn.assistant_msgs:
             for tu in iter_tool_uses(get_content(am)):
-                name = tu.get("name") or ""
+                kind = _KIND_BY_TOOL.get(tu.get("name") or "")
+                if kind is None:
+                    continue
                 inp = tu.get("input")
                 if not isinstance(inp, dict):
                     continue
@@ -63,29 +80,34 @@ def extract_file_ops(turns: list[Turn], source_tool: str = "") -> list[FileOp]:
                 if not isinstance(path_str, str) or not path_str:
                     continue
 
-                abs_path = Path(path_str).expanduser().resolve()
+                abs_path = resolved.get(path_str)
+                if abs_path is None:
+                    abs_path = resolved[path_str] = Path(path_str).expanduser().resolve()
 
-                if name in _WRITE_TOOLS:
+                line_count: int | None = None
+                if kind == "write":
                     content: str = inp.get("content") or ""
-                    # splitlines() correctly handles trailing newlines: "a\nb\n" → 2
-                    line_count = len(content.splitlines()) or None
-                    ops.append(FileOp(abs_path, "write", model, line_count))
-                elif name in _EDIT_TOOLS:
-                    ops.append(FileOp(abs_path, "edit", model, None))
+                    if content:
+                        # Count without building a list of lines; a trailing
+                        # newline does not start a new line: "a\nb\n" → 2.
+                        # Same rule as the on-disk count for edit-only files.
+                        line_count = content.count("\n") + (0 if content.endswith("\n") else 1)
+                ops.append(FileOp(abs_path, kind, model, line_count))
 
     return ops
 
 
 def detect_repo_root(file_paths: list[Path], fallback: Path | None = None) -> Path | None:
-    """Detect git repository root from absolute file paths via git rev-parse."""
+    """Detect git repository root from absolute file paths via a .git ancestor walk."""
     candidates: set[Path] = set()
 
-    search_dirs = [p.parent for p in file_paths if p.is_absolute()]
+    # Many edited files share a parent; look each directory up once.
+    search_dirs = {p.parent for p in file_paths if p.is_absolute()}
     if fallback:
-        search_dirs.append(fallback)
+        search_dirs.add(fallback)
 
     for d in search_dirs:
-        root = _git_toplevel(d)
+        root = _find_toplevel(d)
         if root:
             candidates.add(root)
 
@@ -97,6 +119,9 @@ def detect_repo_root(file_paths: list[Path], fallback: Path | None = None) -> Pa
 
 def get_git_revision(repo_root: Path) -> str | None:
     """Return the current HEAD commit SHA, or None if unavailable."""
+    revision = _read_head_revision(repo_root)
+    if revision:
+        return revision
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
@@ -112,20 +137,74 @@ def get_git_revision(repo_root: Path) -> str | None:
     return None
 
 
-def _git_toplevel(directory: Path) -> Path | None:
-    if not directory.is_dir():
-        directory = directory.parent
+def _read_head_revision(repo_root: Path) -> str | None:
+    """Resolve HEAD from the git directory without spawning git.
+
+    Handles detached HEAD, loose refs, packed-refs, and linked worktrees
+    (``.git`` file + ``commondir``). Returns None whenever the layout is
+    unexpected so the caller can fall back to ``git rev-parse``.
+    """
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=directory,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            toplevel = result.stdout.strip()
-            return Path(toplevel) if toplevel else None
-    except Exception as e:
-        logger.debug("git rev-parse --show-toplevel failed in %s: %s", directory, e)
+        git_dir = _git_dir(repo_root)
+        if git_dir is None:
+            return None
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref: "):
+            return head if _is_object_id(head) else None
+        ref = head[5:].strip()
+
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.is_file():
+            common_dir = git_dir / commondir_file.read_text(encoding="utf-8").strip()
+
+        for base in dict.fromkeys((git_dir, common_dir)):
+            try:
+                sha = (base / ref).read_text(encoding="utf-8").strip()
+            except FileNotFoundError:
+                continue
+            return sha if _is_object_id(sha) else None
+
+        packed = common_dir / "packed-refs"
+        if packed.is_file():
+            suffix = " " + ref
+            for line in packed.read_text(encoding="utf-8").splitlines():
+                if line.endswith(suffix):
+                    sha = line[: -len(suffix)]
+                    return sha if _is_object_id(sha) else None
+    except OSError as e:
+        logger.debug("reading HEAD under %s failed: %s", repo_root, e)
     return None
+
+
+def _git_dir(repo_root: Path) -> Path | None:
+    dot_git = repo_root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if not dot_git.is_file():
+        return None
+    text = dot_git.read_text(encoding="utf-8").strip()
+    if not text.startswith("gitdir:"):
+        return None
+    return repo_root / text[7:].strip()  # absolute gitdir replaces repo_root
+
+
+def _is_object_id(value: str) -> bool:
+    # SHA-1 (40) or SHA-256 (64) hex object name
+    return len(value) in (40, 64) and all(c in "0123456789abcdef" for c in value)
+
+
+@functools.lru_cache(maxsize=256)
+def _find_toplevel(directory: Path) -> Path | None:
+    """Return the nearest ancestor (inclusive) containing ``.git``, or None.
+
+    ``.git`` may be a directory or a file (worktrees, submodules). Recursing
+    through the cache lets sibling directories share the ancestor lookups,
+    so each distinct ancestor costs a single stat.
+    """
+    if os.path.exists(os.path.join(directory, ".git")):
+        return directory
+    parent = directory.parent
+    if parent == directory:
+        return None
+    return _find_toplevel(parent)
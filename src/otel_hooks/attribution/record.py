@@ -9,44 +9,44 @@ from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Range:
     start_line: int
     end_line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Contributor:
     type: str  # "ai" | "human" | "mixed" | "unknown"
     model: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     contributor: Contributor
     ranges: list[Range]
     url: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FileRecord:
     path: str  # repo-root-relative, forward slashes
     conversations: list[Conversation]
 
 
-@dataclass
+@dataclass(slots=True)
 class VcsInfo:
     type: str  # "git" | "jj" | "hg" | "svn"
     revision: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolInfo:
     name: str
     version: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceRecord:
     version: str
     id: str
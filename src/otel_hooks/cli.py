@@ -1,22 +1,60 @@
 """CLI for otel-hooks."""
 
+from __future__ import annotations
+
 import argparse
+import copy
+import functools
+import re
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from importlib.metadata import version
-from typing import Callable
-
-import questionary
-from rich.console import Console
+from typing import Callable, Iterator, NamedTuple, Sequence
 
 from . import config as cfg
 from .tools import Scope, available_tools, get_tool, ToolConfig
 
-console = Console(stderr=True)
+
+class _LazyConsole:
+    """Stand-in for the stderr rich Console, built on first attribute access.
+
+    rich.console costs ~25ms to import, and the `hook` path never prints
+    through it.
+    """
+
+    def __getattr__(self, name: str):
+        real = self.__dict__.get("_real")
+        if real is None:
+            from rich.console import Console
+
+            real = self.__dict__["_real"] = Console(stderr=True)
+        return getattr(real, name)
+
+
+console = _LazyConsole()
 
 PROVIDERS = ["langfuse", "otlp", "datadog"]
-TOOLS = available_tools()
-TOOL_CHOICES = [*TOOLS, "all"]
+_PROVIDER_SET = frozenset(PROVIDERS)
+_PROVIDER_RE = re.compile(r"--provider\s+(\w+)")
+_LEGACY_ENV_RE = re.compile(r"OTEL_HOOKS_SOURCE_TOOL=\S+\s+")
+
+
+class _ToolList(NamedTuple):
+    """Registered tool names and the views the CLI derives from them."""
+
+    names: tuple[str, ...]
+    members: frozenset[str]
+    choices: tuple[str, ...]  # "Which tool?" menu entries, ending with "all"
+
+    @classmethod
+    def of(cls, names: Sequence[str]) -> _ToolList:
+        names = tuple(names)
+        return cls(names, frozenset(names), (*names, "all"))
+
+
+# Discovered on first use: enumerating tools imports every tool module, which
+# commands like ``version`` or ``hook`` without --tool never need.
+@functools.cache
+def _tools() -> _ToolList:
+    return _ToolList.of(available_tools())
 
 
 class _NoTTYError(SystemExit):
@@ -24,6 +62,8 @@ class _NoTTYError(SystemExit):
         super().__init__(f"No TTY detected. Use {flag} to run non-interactively.")
 
 
+# stdin does not change mid-run; enable asks before every prompt.
+@functools.lru_cache(maxsize=1)
 def _is_tty() -> bool:
     return sys.stdin.isatty()
 
@@ -33,8 +73,11 @@ def _require_tty(flag: str) -> None:
         raise _NoTTYError(flag)
 
 
-def _select(message: str, choices: list[str], flag: str) -> str:
+def _select(message: str, choices: Sequence[str], flag: str) -> str:
     _require_tty(flag)
+    # questionary pulls in prompt_toolkit; import it only when actually prompting.
+    import questionary
+
     selected = questionary.select(message, choices=choices).ask()
     if selected is None:
         raise SystemExit(1)
@@ -43,6 +86,8 @@ def _select(message: str, choices: list[str], flag: str) -> str:
 
 def _confirm(message: str, *, default: bool = False) -> bool:
     _require_tty("--yes")
+    import questionary
+
     result = questionary.confirm(message, default=default).ask()
     if result is None:
         raise SystemExit(1)
@@ -52,6 +97,8 @@ def _confirm(message: str, *, default: bool = False) -> bool:
 def _text(message: str, *, default: str = "", flag: str = "") -> str:
     if flag:
         _require_tty(flag)
+    import questionary
+
     result = questionary.text(message, default=default).ask()
     return result or default
 
@@ -59,6 +106,8 @@ def _text(message: str, *, default: str = "", flag: str = "") -> str:
 def _password(message: str, *, flag: str = "") -> str:
     if flag:
         _require_tty(flag)
+    import questionary
+
     result = questionary.password(message).ask()
     return result or ""
 
@@ -67,12 +116,12 @@ def _resolve_tools(args: argparse.Namespace) -> list[str]:
     """Return list of tool names to operate on."""
     tool = getattr(args, "tool", None)
     if tool == "all":
-        return list(TOOLS)
+        return list(_tools().names)
     if tool:
         return [tool]
 
-    selected = _select("Which tool?", TOOL_CHOICES, "--tool")
-    return list(TOOLS) if selected == "all" else [selected]
+    selected = _select("Which tool?", _tools().choices, "--tool")
+    return list(_tools().names) if selected == "all" else [selected]
 
 
 def _resolve_scope(args: argparse.Namespace, tool_cfg: ToolConfig | None = None) -> Scope:
@@ -115,9 +164,16 @@ def _resolve_providers(args: argparse.Namespace) -> list[str]:
 
 
 def _clone_args(args: argparse.Namespace, **overrides: object) -> argparse.Namespace:
-    values = vars(args).copy()
-    values.update(overrides)
-    return argparse.Namespace(**values)
+    clone = copy.copy(args)
+    for name, value in overrides.items():
+        setattr(clone, name, value)
+    return clone
+
+
+# Below this many tools, thread start-up and joins cost more than the
+# per-tool settings I/O they would overlap (each action is one or two small
+# file reads/writes).
+_PARALLEL_MIN_TOOLS = 4
 
 
 def _run_tool_actions(
@@ -126,53 +182,118 @@ def _run_tool_actions(
     *,
     failure_label: str,
     parallel: bool,
+    fail_fast: bool = False,
 ) -> int:
-    rc = 0
-    if not parallel or len(tools) <= 1:
-        for tool_name in tools:
-            try:
-                rc |= action(tool_name)
-            except Exception as e:
-                console.print(f"[yellow]Warning:[/yellow] failed to {failure_label} {tool_name}: {e}")
-                rc = 1
+    """Run *action* per tool and OR the return codes.
+
+    With *fail_fast*, stop at the first failure: later tools are skipped in
+    the sequential path and not-yet-started pool tasks are cancelled otherwise.
+    """
+
+    def attempt(tool_name: str) -> tuple[int, Exception | None]:
+        try:
+            return action(tool_name), None
+        except Exception as e:
+            return 1, e
+
+    def report(outcomes: Iterator[tuple[int, Exception | None]]) -> int:
+        rc = 0
+        for tool_name, (code, error) in zip(tools, outcomes):
+            if error is not None:
+                console.print(f"[yellow]Warning:[/yellow] failed to {failure_label} {tool_name}: {error}")
+            rc |= code
+            if rc and fail_fast:
+                break
         return rc
 
+    if not parallel or len(tools) < _PARALLEL_MIN_TOOLS:
+        return report(map(attempt, tools))
+
+    # Deferred: sequential runs never load concurrent.futures.
+    from concurrent.futures import ThreadPoolExecutor
+
+    # executor.map yields in submission order, so warnings print from this
+    # thread in tool order without a futures dict or as_completed wake-ups.
     with ThreadPoolExecutor(max_workers=min(8, len(tools))) as ex:
-        futures = {ex.submit(action, tool_name): tool_name for tool_name in tools}
-        for fut in as_completed(futures):
-            tool_name = futures[fut]
-            try:
-                rc |= fut.result()
-            except Exception as e:
-                console.print(f"[yellow]Warning:[/yellow] failed to {failure_label} {tool_name}: {e}")
-                rc = 1
-    return rc
+        outcomes = ex.map(attempt, tools)
+        try:
+            return report(outcomes)
+        finally:
+            outcomes.close()  # cancels the tasks that have not started
+
+
+# KEY=value lines piped on stdin, read once per process (None until read).
+_stdin_env: dict[str, str] | None = None
+
+
+def _read_stdin_env() -> dict[str, str]:
+    global _stdin_env
+    if _stdin_env is None:
+        _stdin_env = {}
+        for line in sys.stdin.read().splitlines():
+            key, sep, value = line.partition("=")
+            if sep and key.strip():
+                _stdin_env[key.strip()] = value.strip()
+    return _stdin_env
+
+
+def _collect_env(keys: Sequence[cfg.ProviderKey], *, from_stdin: bool = False) -> dict[str, str]:
+    """Collect values for provider keys, keyed by field.
+
+    With *from_stdin* (``enable --stdin``), values come from a single read of
+    ``KEY=value`` lines on stdin instead of one prompt per key; missing keys
+    are left unset.
+    """
+    if not keys:
+        return {}
+    if from_stdin:
+        piped = _read_stdin_env()
+        return {k.field: piped[k.env_var] for k in keys if piped.get(k.env_var)}
+    values: dict[str, str] = {}
+    for key in keys:
+        value = (_password if key.secret else _text)(f"{key.env_var}:")
+        if value:
+            values[key.field] = value
+    return values
 
 
 def _write_provider_config_for_scope(
     *,
-    provider: str,
+    providers: list[str],
     config_scope: Scope,
     skip_project_secrets: bool,
     extra: dict | None = None,
+    from_stdin: bool = False,
+    merged: dict | None = None,
 ) -> None:
+    """Apply every provider's keys (and extra) to one scope's config, saved once.
+
+    *merged* is the caller's already loaded ``cfg.load_config()`` result, if any.
+    """
     otel_cfg = cfg.load_raw_config(config_scope)
+    # Loop-invariant: secrets never go into the shared project file on enable.
+    skip_secrets = skip_project_secrets and config_scope is Scope.PROJECT
 
-    provider_keys = cfg.env_keys_for_provider(provider)
-    if provider_keys:
-        merged = cfg.load_config()
-        merged_section = merged.get(provider, {})
-        section = otel_cfg.setdefault(provider, {})
-        for field, env_var in provider_keys:
-            if section.get(field) or merged_section.get(field):
+    for provider in providers:
+        provider_keys = cfg.env_keys_for_provider(provider)
+        if not provider_keys:
+            continue
+        if merged is None:
+            merged = cfg.load_config()
+        have_merged = merged.get(provider, {}).get
+        section = otel_cfg.get(provider)
+        if section is None:
+            section = otel_cfg[provider] = {}
+        have = section.get
+        pending: list[cfg.ProviderKey] = []
+        for key in provider_keys:
+            if have(key.field) or have_merged(key.field):
                 continue
-            if skip_project_secrets and "SECRET" in env_var and config_scope is Scope.PROJECT:
-                console.print(f"  [dim]{env_var}: skipped (use --local or --global for secrets)[/dim]")
+            if skip_secrets and key.secret:
+                console.print(f"  [dim]{key.env_var}: skipped (use --local or --global for secrets)[/dim]")
                 continue
-            ask_fn = _password if "SECRET" in env_var else _text
-            value = ask_fn(f"{env_var}:")
-            if value:
-                section[field] = value
+            pending.append(key)
+        section.update(_collect_env(pending, from_stdin=from_stdin))
 
     if extra:
         for k, v in extra.items():
@@ -194,8 +315,17 @@ def _add_scope_flags(parser: argparse.ArgumentParser) -> None:
                        help="Use local scope")
 
 
+def _tool_name(value: str) -> str:
+    # Validated on use rather than via choices=, so building the parser does
+    # not enumerate tools.
+    if value == "all" or value in _tools().members:
+        return value
+    choices = ", ".join(repr(c) for c in _tools().choices)
+    raise argparse.ArgumentTypeError(f"invalid choice: {value!r} (choose from {choices})")
+
+
 def _add_tool_flag(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument("--tool", choices=TOOL_CHOICES,
+    parser.add_argument("--tool", type=_tool_name,
                         help="Target tool (claude, cursor, codex, ... or 'all')")
 
 
@@ -207,21 +337,36 @@ def _enable_codex(args: argparse.Namespace) -> int:
     codex = CodexConfig()
     codex_cfg = codex.load_settings(Scope.GLOBAL)
 
-    merged = cfg.load_config()
-    merged_section = merged.get(provider, {})
+    if provider not in ("langfuse", "otlp"):
+        console.print(f"[red]Provider '{provider}' is not supported for codex. Use langfuse or otlp.[/red]")
+        return 1
+
+    merged_section = cfg.load_config().get(provider, {})
+    piped = _read_stdin_env() if getattr(args, "stdin", False) else None
+
+    def _value(field: str, env_var: str, ask: Callable[[], str], default: str = "") -> str:
+        if merged_section.get(field):
+            return merged_section[field]
+        if piped is not None:
+            return piped.get(env_var) or default
+        return ask()
 
     if provider == "langfuse":
-        public_key = merged_section.get("public_key") or _text("LANGFUSE_PUBLIC_KEY:")
-        secret_key = merged_section.get("secret_key") or _password("LANGFUSE_SECRET_KEY:")
-        base_url = merged_section.get("base_url") or _text("LANGFUSE_BASE_URL:", default="https://cloud.langfuse.com")
+        public_key = _value("public_key", "LANGFUSE_PUBLIC_KEY", lambda: _text("LANGFUSE_PUBLIC_KEY:"))
+        secret_key = _value("secret_key", "LANGFUSE_SECRET_KEY", lambda: _password("LANGFUSE_SECRET_KEY:"))
+        base_url = _value(
+            "base_url",
+            "LANGFUSE_BASE_URL",
+            lambda: _text("LANGFUSE_BASE_URL:", default="https://cloud.langfuse.com"),
+            default="https://cloud.langfuse.com",
+        )
         codex_cfg = codex.enable_langfuse(codex_cfg, public_key, secret_key, base_url)
-    elif provider == "otlp":
-        endpoint = merged_section.get("endpoint") or _text("OTEL_EXPORTER_OTLP_ENDPOINT:")
-        headers = merged_section.get("headers") or _text("OTEL_EXPORTER_OTLP_HEADERS (k=v,k=v):")
-        codex_cfg = codex.enable_otlp(codex_cfg, endpoint, headers)
     else:
-        console.print(f"[red]Provider '{provider}' is not supported for codex. Use langfuse or otlp.[/red]")
-        return 1
+        endpoint = _value("endpoint", "OTEL_EXPORTER_OTLP_ENDPOINT", lambda: _text("OTEL_EXPORTER_OTLP_ENDPOINT:"))
+        headers = _value(
+            "headers", "OTEL_EXPORTER_OTLP_HEADERS", lambda: _text("OTEL_EXPORTER_OTLP_HEADERS (k=v,k=v):")
+        )
+        codex_cfg = codex.enable_otlp(codex_cfg, endpoint, headers)
 
     codex.save_settings(codex_cfg, Scope.GLOBAL)
     console.print(f"[green]Enabled.[/green] Settings written to {codex.settings_path(Scope.GLOBAL)}")
@@ -230,8 +375,6 @@ def _enable_codex(args: argparse.Namespace) -> int:
 
 def _migrate_env_var_to_tool_flag(settings: dict, tool_name: str) -> None:
     """Rewrite legacy `OTEL_HOOKS_SOURCE_TOOL=<t> cmd` to `cmd --tool <t>`."""
-    import re
-
     hooks = settings.get("hooks", {})
     for _event, group in hooks.items():
         if not isinstance(group, list):
@@ -243,12 +386,14 @@ def _migrate_env_var_to_tool_flag(settings: dict, tool_name: str) -> None:
                 cmd = item.get(key, "")
                 if not cmd or "OTEL_HOOKS_SOURCE_TOOL=" not in cmd:
                     continue
-                new_cmd = re.sub(r"OTEL_HOOKS_SOURCE_TOOL=\S+\s+", "", cmd)
+                new_cmd = _LEGACY_ENV_RE.sub("", cmd)
                 if "--tool" not in new_cmd:
                     new_cmd = f"{new_cmd} --tool {tool_name}"
                 item[key] = new_cmd
 
 
+# argv[0] and PATH are fixed for the process; enable asks once per tool.
+@functools.lru_cache(maxsize=1)
 def _detect_runner_prefix() -> str:
     """Detect if running via uvx/pipx and return the appropriate command prefix.
 
@@ -283,12 +428,15 @@ def _enable_one(
     *,
     providers: list[str],
     show_status: bool,
+    resolved: tuple[ToolConfig, Scope] | None = None,
 ) -> int:
     if tool_name == "codex":
         return _enable_codex(_clone_args(args, provider=providers[0]))
 
-    tool_cfg = get_tool(tool_name)
-    scope = _resolve_scope(args, tool_cfg)
+    if resolved is None:
+        tool_cfg = get_tool(tool_name)
+        resolved = (tool_cfg, _resolve_scope(args, tool_cfg))
+    tool_cfg, scope = resolved
     config_scope = Scope.PROJECT if scope is Scope.PROJECT else Scope.GLOBAL
 
     def _register_hooks() -> None:
@@ -299,7 +447,8 @@ def _enable_one(
         tool_cfg.save_settings(tool_settings, scope)
 
     label = ", ".join(providers)
-    if show_status:
+    # The spinner runs a refresh thread; skip it when stderr is not a terminal.
+    if show_status and console.is_terminal:
         with console.status(f"Enabling {tool_name} ({scope.value}, provider={label})..."):
             _register_hooks()
     else:
@@ -316,13 +465,13 @@ def cmd_enable(args: argparse.Namespace) -> int:
     # Write config for the first provider (primary)
     resolved_args = _clone_args(args, provider=providers[0])
 
-    config_scopes: set[Scope] = set()
-    for tool_name in tools:
-        if tool_name == "codex":
-            continue
-        tool_cfg = get_tool(tool_name)
-        scope = _resolve_scope(resolved_args, tool_cfg)
-        config_scopes.add(Scope.PROJECT if scope is Scope.PROJECT else Scope.GLOBAL)
+    # (tool config, scope) resolved once here; _enable_one reuses the pair.
+    plan: dict[str, tuple[ToolConfig, Scope]] = {}
+    for t in tools:
+        if t != "codex":
+            tool_cfg = get_tool(t)
+            plan[t] = (tool_cfg, _resolve_scope(resolved_args, tool_cfg))
+    config_scopes = {Scope.PROJECT if s is Scope.PROJECT else Scope.GLOBAL for _, s in plan.values()}
 
     # Attribution: resolve from flag or interactive prompt (before provider write)
     attribution_flag = getattr(args, "attribution", None)
@@ -339,16 +488,16 @@ def cmd_enable(args: argparse.Namespace) -> int:
     )
 
     # Write provider + attribution config in a single save per scope
-    for provider in providers:
-        for config_scope in (Scope.GLOBAL, Scope.PROJECT):
-            if config_scope not in config_scopes:
-                continue
-            _write_provider_config_for_scope(
-                provider=provider,
-                config_scope=config_scope,
-                skip_project_secrets=True,
-                extra=attribution_extra,
-            )
+    for config_scope in (Scope.GLOBAL, Scope.PROJECT):
+        if config_scope not in config_scopes:
+            continue
+        _write_provider_config_for_scope(
+            providers=providers,
+            config_scope=config_scope,
+            skip_project_secrets=True,
+            extra=attribution_extra,
+            from_stdin=getattr(args, "stdin", False),
+        )
 
     if attribution_flag:
         console.print("[dim]Attribution: enabled → spans emitted as ai_session.file_attribution[/dim]")
@@ -360,9 +509,11 @@ def cmd_enable(args: argparse.Namespace) -> int:
             resolved_args,
             providers=providers,
             show_status=len(tools) == 1,
+            resolved=plan.get(tool_name),
         ),
         failure_label="enable",
-        parallel=len(tools) > 1,
+        # Each action writes settings files; one at a time keeps writes ordered.
+        parallel=False,
     )
 
 
@@ -384,53 +535,69 @@ def cmd_disable(args: argparse.Namespace) -> int:
         tools,
         lambda tool_name: _disable_one(tool_name, args),
         failure_label="disable",
-        parallel=len(tools) > 1,
+        parallel=False,
+        fail_fast=getattr(args, "fail_fast", False),
     )
 
 
 def _extract_providers_from_settings(tool_cfg: ToolConfig, scope: Scope) -> list[str]:
     """Extract provider names from registered hook commands in tool settings."""
-    import re
+    return _providers_in_settings(tool_cfg.load_settings(scope))
 
-    settings = tool_cfg.load_settings(scope)
-    providers: list[str] = []
 
-    # Collect all command strings from hook settings
-    commands: list[str] = []
-    hooks_section = settings.get("hooks", {})
-    for _event_name, hook_list in hooks_section.items():
-        if isinstance(hook_list, list):
-            for item in hook_list:
-                if isinstance(item, dict):
-                    # Flat format: {"command": "..."}
-                    cmd = item.get("command", "")
+def _iter_hook_commands(settings: dict) -> Iterator[str]:
+    """Yield every hook command string in flat or nested hook settings."""
+    for hook_list in settings.get("hooks", {}).values():
+        if not isinstance(hook_list, list):
+            continue
+        for item in hook_list:
+            if not isinstance(item, dict):
+                continue
+            # Flat format: {"command": "..."}
+            cmd = item.get("command", "")
+            if cmd:
+                yield cmd
+            # Nested format: {"hooks": [{"command": "..."}]}
+            for sub in item.get("hooks", ()):
+                if isinstance(sub, dict):
+                    cmd = sub.get("command", "")
                     if cmd:
-                        commands.append(cmd)
-                    # Nested format: {"hooks": [{"command": "..."}]}
-                    for sub in item.get("hooks", []):
-                        if isinstance(sub, dict):
-                            cmd = sub.get("command", "")
-                            if cmd:
-                                commands.append(cmd)
-
-    for cmd in commands:
+                        yield cmd
+
+
+def _providers_in_settings(settings: dict) -> list[str]:
+    """Extract provider names from hook commands in an already loaded settings dict."""
+    providers: list[str] = []
+    for cmd in _iter_hook_commands(settings):
         if "otel-hooks hook" not in cmd:
             continue
-        m = re.search(r"--provider\s+(\w+)", cmd)
+        m = _PROVIDER_RE.search(cmd)
         if m:
             providers.append(m.group(1))
         elif "--provider" not in cmd:
             # Legacy: bare "otel-hooks hook" without --provider flag
             providers.append("(default)")
-
     return providers
 
 
+def _gather_tool_status(name: str) -> list[tuple[Scope, bool, list[str], str]]:
+    """Collect (scope, registered, providers, path) rows for one tool."""
+    tool_cfg = get_tool(name)
+    rows: list[tuple[Scope, bool, list[str], str]] = []
+    for scope in tool_cfg.scopes():
+        tool_settings = tool_cfg.load_settings(scope)
+        registered = tool_cfg.is_hook_registered(tool_settings)
+        path = str(tool_cfg.settings_path(scope))
+        rows.append((scope, registered, _providers_in_settings(tool_settings), path))
+    return rows
+
+
 def cmd_status(args: argparse.Namespace) -> int:
+    from rich.console import Group
     from rich.table import Table
 
     tool = getattr(args, "tool", None)
-    tools = list(TOOLS) if not tool or tool == "all" else [tool]
+    tools = list(_tools().names) if not tool or tool == "all" else [tool]
 
     otel_config = cfg.load_config()
 
@@ -444,18 +611,15 @@ def cmd_status(args: argparse.Namespace) -> int:
     all_providers: set[str] = set()
 
     for name in tools:
-        tool_cfg = get_tool(name)
-        for scope in tool_cfg.scopes():
-            tool_settings = tool_cfg.load_settings(scope)
-            registered = tool_cfg.is_hook_registered(tool_settings)
-            path = str(tool_cfg.settings_path(scope))
-            providers = _extract_providers_from_settings(tool_cfg, scope)
+        for scope, registered, providers, path in _gather_tool_status(name):
             all_providers.update(p for p in providers if p != "(default)")
             status = "[green]registered[/green]" if registered else "[dim]not registered[/dim]"
             provider_label = ", ".join(providers) if providers else "-"
             table.add_row(name, scope.value, status, provider_label, path)
 
-    console.print(table)
+    # Everything below the table is collected and rendered with it in one
+    # console.print, so Rich lays out and writes the report once.
+    lines: list[str] = []
 
     # Include providers that have config sections (langfuse/otlp/datadog keys)
     for p in PROVIDERS:
@@ -463,23 +627,24 @@ def cmd_status(args: argparse.Namespace) -> int:
             all_providers.add(p)
 
     if not all_providers:
-        console.print("Provider: [dim](not set)[/dim]")
+        lines.append("Provider: [dim](not set)[/dim]")
     else:
-        console.print(f"Provider(s): [bold]{', '.join(sorted(all_providers))}[/bold]")
+        lines.append(f"Provider(s): [bold]{', '.join(sorted(all_providers))}[/bold]")
 
     for provider in sorted(all_providers):
-        if provider in PROVIDERS:
+        if provider in _PROVIDER_SET:
             pcfg = otel_config.get(provider, {})
-            console.print(f"\n  [{provider}]")
-            for field, env_var in cfg.env_keys_for_provider(provider):
-                val = pcfg.get(field, "")
-                masked = _mask(val) if "SECRET" in env_var and val else (val or "(not set)")
-                console.print(f"    {env_var}: {masked}")
+            lines.append(f"\n  [{provider}]")
+            for key in cfg.env_keys_for_provider(provider):
+                val = pcfg.get(key.field, "")
+                masked = _mask(val) if val and key.secret else (val or "(not set)")
+                lines.append(f"    {key.env_var}: {masked}")
 
     attribution_enabled = bool(otel_config.get("attribution", {}).get("enabled", False))
     attr_label = "[green]enabled[/green]" if attribution_enabled else "[dim]disabled[/dim]"
-    console.print(f"\nFile attribution (ai_session.file_attribution): {attr_label}")
+    lines.append(f"\nFile attribution (ai_session.file_attribution): {attr_label}")
 
+    console.print(Group(table, *lines))
     return 0
 
 
@@ -517,22 +682,28 @@ def _doctor_one(
     fix_provider_config: bool = True,
 ) -> int:
     tool_cfg = get_tool(tool_name)
-    scope = tool_cfg.scopes()[0]
+    scopes = tool_cfg.scopes()
+    scope = scopes[0]
     tool_settings = tool_cfg.load_settings(scope)
     issues: list[str] = []
 
-    if not tool_cfg.is_hook_registered(tool_settings):
+    # The legacy migration below keeps "otel-hooks hook" in every command it
+    # rewrites, so this answer still holds for the fix-up step.
+    was_registered = tool_cfg.is_hook_registered(tool_settings)
+    if not was_registered:
         issues.append(f"Hook not registered in {tool_cfg.settings_path(scope)}")
 
     registered_providers: list[str] = []
+    otel_config: dict | None = None
     if include_provider_checks:
-        for s in tool_cfg.scopes():
+        # The primary scope is already loaded above; only re-read the others.
+        registered_providers.extend(_providers_in_settings(tool_settings))
+        for s in scopes[1:]:
             registered_providers.extend(_extract_providers_from_settings(tool_cfg, s))
         # Deduplicate while preserving order
-        seen: set[str] = set()
-        registered_providers = [p for p in registered_providers if p not in seen and not seen.add(p)]  # type: ignore[func-returns-value]
-        provider_issues = _collect_provider_issues(cfg.load_config(), registered_providers)
-        issues.extend(provider_issues)
+        registered_providers = list(dict.fromkeys(registered_providers))
+        otel_config = cfg.load_config()
+        issues.extend(_collect_provider_issues(otel_config, registered_providers))
 
     if not issues:
         console.print(f"[green]{tool_name}: No issues found.[/green]")
@@ -550,7 +721,7 @@ def _doctor_one(
     _migrate_env_var_to_tool_flag(tool_settings, tool_name)
 
     # Fix hook registration
-    if not tool_cfg.is_hook_registered(tool_settings):
+    if not was_registered:
         providers = _resolve_providers(args)
         for prov in providers:
             cmd = _hook_command_for_provider(prov)
@@ -561,12 +732,12 @@ def _doctor_one(
     if include_provider_checks and fix_provider_config:
         config_scope = Scope.PROJECT if getattr(args, "project", False) else Scope.GLOBAL
         providers_to_fix = registered_providers or _resolve_providers(args)
-        for prov in providers_to_fix:
-            _write_provider_config_for_scope(
-                provider=prov,
-                config_scope=config_scope,
-                skip_project_secrets=False,
-            )
+        _write_provider_config_for_scope(
+            providers=providers_to_fix,
+            config_scope=config_scope,
+            skip_project_secrets=False,
+            merged=otel_config,
+        )
 
     console.print("[green]Fixed.[/green]")
     return 0
@@ -588,11 +759,11 @@ def cmd_doctor(args: argparse.Namespace) -> int:
         tool_cfg = get_tool(tool_name)
         for scope in tool_cfg.scopes():
             all_registered.extend(_extract_providers_from_settings(tool_cfg, scope))
-    # Deduplicate
-    seen_provs: set[str] = set()
-    all_registered = [p for p in all_registered if p not in seen_provs and not seen_provs.add(p)]  # type: ignore[func-returns-value]
+    # Deduplicate while preserving order
+    all_registered = list(dict.fromkeys(all_registered))
 
-    provider_issues = _collect_provider_issues(cfg.load_config(), all_registered)
+    otel_config = cfg.load_config()
+    provider_issues = _collect_provider_issues(otel_config, all_registered)
     if provider_issues:
         console.print(f"[yellow]config: Found {len(provider_issues)} issue(s):[/yellow]")
         for issue in provider_issues:
@@ -602,12 +773,12 @@ def cmd_doctor(args: argparse.Namespace) -> int:
             return 1
         providers_to_fix = all_registered or _resolve_providers(args)
         config_scope = Scope.PROJECT if getattr(args, "project", False) else Scope.GLOBAL
-        for prov in providers_to_fix:
-            _write_provider_config_for_scope(
-                provider=prov,
-                config_scope=config_scope,
-                skip_project_secrets=False,
-            )
+        _write_provider_config_for_scope(
+            providers=providers_to_fix,
+            config_scope=config_scope,
+            skip_project_secrets=False,
+            merged=otel_config,
+        )
         console.print("[green]config: Fixed.[/green]")
 
     # --yes 指定時のみ doctor を並列化（対話プロンプト競合を回避）
@@ -630,24 +801,26 @@ def cmd_hook(_args: argparse.Namespace) -> int:
     return hook_main()
 
 
+def cmd_version(_args: argparse.Namespace) -> int:
+    # importlib.metadata pulls in email/zipfile; only the version command needs it.
+    from importlib.metadata import version
+
+    console.print(version("otel-hooks"))
+    return 0
+
+
 def _mask(value: str) -> str:
-    if len(value) <= 8:
-        return "***"
-    return value[:4] + "..." + value[-4:]
+    # One slice-and-format; short secrets reveal nothing.
+    return f"{value[:4]}...{value[-4:]}" if len(value) > 8 else "***"
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        prog="otel-hooks",
-        description="AI coding tools tracing hooks for observability",
+def _configure_enable(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--provider", choices=PROVIDERS, nargs="+", help="Provider(s) to use")
+    parser.add_argument(
+        "--stdin", action="store_true",
+        help="Read provider keys as KEY=value lines from stdin instead of prompting",
     )
-    sub = parser.add_subparsers(dest="command")
-
-    p_enable = sub.add_parser("enable", help="Enable tracing hooks")
-    _add_scope_flags(p_enable)
-    _add_tool_flag(p_enable)
-    p_enable.add_argument("--provider", choices=PROVIDERS, nargs="+", help="Provider(s) to use")
-    attr_group = p_enable.add_mutually_exclusive_group()
+    attr_group = parser.add_mutually_exclusive_group()
     attr_group.add_argument(
         "--attribution", dest="attribution", action="store_true", default=None,
         help="Enable file attribution tracking (ai_session.file_attribution spans)",
@@ -657,40 +830,114 @@ def main() -> None:
         help="Disable file attribution tracking",
     )
 
-    p_disable = sub.add_parser("disable", help="Disable tracing hooks")
-    _add_scope_flags(p_disable)
-    _add_tool_flag(p_disable)
 
-    p_status = sub.add_parser("status", help="Show current status")
-    _add_scope_flags(p_status)
-    _add_tool_flag(p_status)
+def _configure_disable(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop at the first tool that fails to disable")
+
+
+def _configure_doctor(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--yes", "-y", action="store_true",
+                        help="Auto-fix without confirmation")
+
+
+def _configure_hook(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--provider", choices=PROVIDERS, help="Provider to use for this hook invocation")
+
 
-    p_doctor = sub.add_parser("doctor", help="Check and fix configuration issues")
-    _add_scope_flags(p_doctor)
-    _add_tool_flag(p_doctor)
-    p_doctor.add_argument("--yes", "-y", action="store_true",
-                          help="Auto-fix without confirmation")
+_SHARED_FLAGS: dict[str, Callable[[argparse.ArgumentParser], None]] = {
+    "scope": _add_scope_flags,
+    "tool": _add_tool_flag,
+}
 
-    p_hook = sub.add_parser("hook", help="Run the tracing hook (called by AI tools)")
-    _add_tool_flag(p_hook)
-    p_hook.add_argument("--provider", choices=PROVIDERS, help="Provider to use for this hook invocation")
+# Subcommand name → (help text, shared flag groups, extra-argument builder).
+# Builders run lazily so that `otel-hooks hook` (invoked on every AI tool
+# event) only builds its own parser.
+_SUBCOMMANDS: dict[
+    str, tuple[str, tuple[str, ...], Callable[[argparse.ArgumentParser], None] | None]
+] = {
+    "enable": ("Enable tracing hooks", ("scope", "tool"), _configure_enable),
+    "disable": ("Disable tracing hooks", ("scope", "tool"), _configure_disable),
+    "status": ("Show current status", ("scope", "tool"), None),
+    "doctor": ("Check and fix configuration issues", ("scope", "tool"), _configure_doctor),
+    "hook": ("Run the tracing hook (called by AI tools)", ("tool",), _configure_hook),
+    "version": ("Show version", (), None),
+}
 
-    sub.add_parser("version", help="Show version")
 
-    args = parser.parse_args()
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="otel-hooks",
+        description="AI coding tools tracing hooks for observability",
+    )
+    # Shared flag groups are built once and attached via parents=[...]
+    # instead of being re-added to every subparser.
+    shared: dict[str, argparse.ArgumentParser] = {}
+    for kind, add_flags in _SHARED_FLAGS.items():
+        shared[kind] = argparse.ArgumentParser(add_help=False)
+        add_flags(shared[kind])
+
+    sub = parser.add_subparsers(dest="command")
+    for name, (help_text, flags, configure) in _SUBCOMMANDS.items():
+        p = sub.add_parser(name, help=help_text, parents=[shared[kind] for kind in flags])
+        if configure:
+            configure(p)
+    return parser
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    """Parse argv, building only the selected subcommand's parser when possible.
+
+    The full parser tree is built only for top-level help, no command, or an
+    unknown command (so argparse can report usage and choices).
+    """
+    if argv and argv[0] in _SUBCOMMANDS:
+        name = argv[0]
+        help_text, flags, configure = _SUBCOMMANDS[name]
+        parser = argparse.ArgumentParser(prog=f"otel-hooks {name}", description=help_text)
+        for kind in flags:
+            _SHARED_FLAGS[kind](parser)
+        if configure:
+            configure(parser)
+        args = parser.parse_args(argv[1:])
+        args.command = name
+        return args
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
     if not args.command:
         parser.print_help()
         sys.exit(0)
+    return args
 
-    commands = {
-        "enable": cmd_enable,
-        "disable": cmd_disable,
-        "status": cmd_status,
-        "doctor": cmd_doctor,
-        "hook": cmd_hook,
-        "version": lambda _: console.print(version("otel-hooks")) or 0,
-    }
-    sys.exit(commands[args.command](args))
+
+def main() -> None:
+    argv = sys.argv[1:]
+    # AI tools run `otel-hooks hook` on every event. hook.main reads its own
+    # --provider/--tool flags and tolerates bad values, so skip argparse here.
+    if argv[:1] == ["hook"] and "-h" not in argv and "--help" not in argv:
+        from .hook import main as hook_main
+        sys.exit(hook_main())
+    # `version` takes no flags; anything beyond it goes to argparse for errors.
+    if argv == ["version"]:
+        sys.exit(cmd_version(argparse.Namespace(command="version")))
+
+    args = _parse_args(argv)
+
+    command = args.command
+    if command == "status":
+        rc = cmd_status(args)
+    elif command == "enable":
+        rc = cmd_enable(args)
+    elif command == "disable":
+        rc = cmd_disable(args)
+    elif command == "doctor":
+        rc = cmd_doctor(args)
+    elif command == "version":
+        rc = cmd_version(args)
+    else:
+        rc = cmd_hook(args)
+    sys.exit(rc)
 
 
 if __name__ == "__main__":
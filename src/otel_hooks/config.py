@@ -7,16 +7,15 @@ Config files:
 Merge order: global → project → environment variables (highest priority).
 """
 
-import json
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple
 
 logger = logging.getLogger(__name__)
 
-from .file_io import atomic_write
 from .tools import Scope
+from .tools.json_io import load_json, save_json
 
 
 def config_path(scope: Scope) -> Path:
@@ -26,9 +25,7 @@ def config_path(scope: Scope) -> Path:
 
 
 def _read_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
-    return json.loads(path.read_text(encoding="utf-8"))
+    return load_json(path)
 
 
 # Mapping: config key → (section, field) → env var name
@@ -38,20 +35,34 @@ _ENV_OVERRIDES: list[tuple[str, str]] = [
     ("state_dir", "OTEL_HOOKS_STATE_DIR"),
 ]
 
-_PROVIDER_ENV: Dict[str, list[tuple[str, str]]] = {
-    "langfuse": [
-        ("public_key", "LANGFUSE_PUBLIC_KEY"),
-        ("secret_key", "LANGFUSE_SECRET_KEY"),
-        ("base_url", "LANGFUSE_BASE_URL"),
-    ],
-    "otlp": [
-        ("endpoint", "OTEL_EXPORTER_OTLP_ENDPOINT"),
-        ("headers", "OTEL_EXPORTER_OTLP_HEADERS"),
-    ],
-    "datadog": [
-        ("service", "DD_SERVICE"),
-        ("env", "DD_ENV"),
-    ],
+
+class ProviderKey(NamedTuple):
+    """One provider config field and the env var that overrides it.
+
+    ``secret`` marks credentials: prompted without echo, masked in status
+    output, and never written to the (shareable) project config.
+    """
+
+    field: str
+    env_var: str
+    secret: bool = False
+
+
+# Tuples: env_keys_for_provider hands these out shared, so they must not be mutable.
+_PROVIDER_ENV: Dict[str, tuple[ProviderKey, ...]] = {
+    "langfuse": (
+        ProviderKey("public_key", "LANGFUSE_PUBLIC_KEY"),
+        ProviderKey("secret_key", "LANGFUSE_SECRET_KEY", secret=True),
+        ProviderKey("base_url", "LANGFUSE_BASE_URL"),
+    ),
+    "otlp": (
+        ProviderKey("endpoint", "OTEL_EXPORTER_OTLP_ENDPOINT"),
+        ProviderKey("headers", "OTEL_EXPORTER_OTLP_HEADERS"),
+    ),
+    "datadog": (
+        ProviderKey("service", "DD_SERVICE"),
+        ProviderKey("env", "DD_ENV"),
+    ),
 }
 
 
@@ -81,8 +92,9 @@ def load_raw_config(scope: Scope) -> Dict[str, Any]:
 
 def _apply_env_overrides(merged: Dict[str, Any]) -> None:
     """Environment variables override all config sources."""
+    env = os.environ
     for config_key, env_var in _ENV_OVERRIDES:
-        val = os.environ.get(env_var)
+        val = env.get(env_var)
         if val:
             if config_key == "max_chars":
                 try:
@@ -94,23 +106,17 @@ def _apply_env_overrides(merged: Dict[str, Any]) -> None:
             else:
                 merged[config_key] = val
 
-    # Apply provider-specific env overrides for all configured providers
+    # Apply provider-specific env overrides; each variable is read once and a
+    # section is only created when at least one of its variables is set.
     for provider, fields in _PROVIDER_ENV.items():
-        if provider not in merged:
-            # Only apply if env vars are actually set
-            has_env = any(os.environ.get(env_var) for _, env_var in fields)
-            if not has_env:
-                continue
-        section = merged.setdefault(provider, {})
-        for field, env_var in fields:
-            val = os.environ.get(env_var)
-            if val:
-                section[field] = val
+        overrides = {k.field: val for k in fields if (val := env.get(k.env_var))}
+        if overrides:
+            merged.setdefault(provider, {}).update(overrides)
 
 
 def save_config(data: Dict[str, Any], scope: Scope) -> None:
     """Save config to the specified scope."""
-    atomic_write(config_path(scope), (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+    save_json(config_path(scope), data)
 
 
 def get_provider_config(config: Dict[str, Any], provider: str) -> Dict[str, str]:
@@ -118,6 +124,6 @@ def get_provider_config(config: Dict[str, Any], provider: str) -> Dict[str, str]
     return config.get(provider, {})
 
 
-def env_keys_for_provider(provider: str) -> list[tuple[str, str]]:
-    """Return (config_field, env_var_name) pairs for a provider."""
-    return _PROVIDER_ENV.get(provider, [])
+def env_keys_for_provider(provider: str) -> tuple[ProviderKey, ...]:
+    """Return the (field, env_var, secret) keys for a provider."""
+    return _PROVIDER_ENV.get(provider, ())
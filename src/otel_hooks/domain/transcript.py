@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from typing import Any
 
+from otel_hooks.json_codec import loads as json_loads
+
 logger = logging.getLogger(__name__)
 
 MAX_CHARS_DEFAULT = 20000
@@ -63,12 +65,34 @@ def get_role(msg: dict[str, Any]) -> str | None:
 def is_tool_result(msg: dict[str, Any]) -> bool:
     if get_role(msg) != "user":
         return False
-    content = get_content(msg)
+    return _has_tool_result(get_content(msg))
+
+
+def _has_tool_result(content: Any) -> bool:
     if not isinstance(content, list):
         return False
     return any(isinstance(x, dict) and x.get("type") == "tool_result" for x in content)
 
 
+def _message_fields(msg: dict[str, Any]) -> tuple[str | None, Any, str | None]:
+    """Return (get_role, get_content, get_message_id) with one envelope lookup.
+
+    Decoded JSONL only yields plain dicts, so an exact type check is used
+    instead of isinstance.
+    """
+    m = msg.get("message")
+    if type(m) is not dict:
+        role = msg.get("type")
+        return (role if role in ("user", "assistant") else None), msg.get("content"), None
+    role = msg.get("type")
+    if role not in ("user", "assistant"):
+        role = m.get("role")
+        if role not in ("user", "assistant"):
+            role = None
+    mid = m.get("id")
+    return role, m.get("content"), (mid if mid and type(mid) is str else None)
+
+
 def iter_tool_results(content: Any) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
     if isinstance(content, list):
@@ -101,6 +125,13 @@ def extract_text(content: Any) -> str:
     return ""
 
 
+@lru_cache(maxsize=32)
+def _sha256_hex(s: str) -> str:
+    # The same long text is often truncated more than once (the last assistant
+    # message in build_turn_payload, re-processed turns after a failed flush).
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
 def truncate_text(s: str, max_chars: int = MAX_CHARS_DEFAULT) -> tuple[str, dict[str, Any]]:
     if s is None:
         return "", {"truncated": False, "orig_len": 0}
@@ -112,7 +143,7 @@ def truncate_text(s: str, max_chars: int = MAX_CHARS_DEFAULT) -> tuple[str, dict
         "truncated": True,
         "orig_len": orig_len,
         "kept_len": len(head),
-        "sha256": hashlib.sha256(s.encode("utf-8")).hexdigest(),
+        "sha256": _sha256_hex(s),
     }
 
 
@@ -184,19 +215,21 @@ def build_turns(messages: list[dict[str, Any]]) -> list[Turn]:
         if current_user is None or not assistant_latest:
             return
         assistants = [assistant_latest[mid] for mid in assistant_order if mid in assistant_latest]
+        # Hand the dict off instead of copying it: flush_turn() is only called
+        # right before tool_results_by_id is rebound to a fresh dict or at end of input.
         turns.append(
             Turn(
                 user_msg=current_user,
                 assistant_msgs=assistants,
-                tool_results_by_id=dict(tool_results_by_id),
+                tool_results_by_id=tool_results_by_id,
             )
         )
 
     for msg in messages:
-        role = get_role(msg)
-        if is_tool_result(msg):
+        role, content, message_id = _message_fields(msg)
+        if role == "user" and _has_tool_result(content):
             entry_ts = get_timestamp(msg)
-            for tr in iter_tool_results(get_content(msg)):
+            for tr in iter_tool_results(content):
                 tid = tr.get("tool_use_id")
                 if tid:
                     tool_results_by_id[str(tid)] = ToolResultRecord(
@@ -214,7 +247,7 @@ def build_turns(messages: list[dict[str, Any]]) -> list[Turn]:
         if role == "assistant":
             if current_user is None:
                 continue
-            mid = get_message_id(msg) or f"noid:{len(assistant_order)}"
+            mid = message_id or f"noid:{len(assistant_order)}"
             if mid not in assistant_latest:
                 assistant_order.append(mid)
             assistant_latest[mid] = msg
@@ -226,11 +259,12 @@ def build_turns(messages: list[dict[str, Any]]) -> list[Turn]:
 def decode_jsonl_lines(lines: list[str]) -> list[dict[str, Any]]:
     msgs: list[dict[str, Any]] = []
     for line in lines:
-        line = line.strip()
-        if not line:
+        # Both json and orjson accept surrounding whitespace (incl. a CRLF \r),
+        # so only blank lines need filtering; no per-line strip() copy.
+        if not line or line.isspace():
             continue
         try:
-            msgs.append(json.loads(line))
+            msgs.append(json_loads(line))
         except Exception:
             logger.debug("Skipping malformed JSONL line: %.100s", line)
             continue
@@ -6,17 +6,42 @@ import os
 from pathlib import Path
 
 
-def atomic_write(path: Path, data: bytes, mode: int = 0o600) -> None:
+def atomic_write(path: Path, data: bytes, mode: int = 0o600, *, durable: bool = False) -> None:
     """Write data atomically with explicit file permissions.
 
-    Creates a temporary file with the given permissions, writes data,
-    then atomically replaces the target path.
+    Creates a temporary file with the given permissions, writes data, and
+    atomically replaces the target path. With *durable*, the data is fsynced
+    before the rename and the parent directory after it, so the new contents
+    survive a crash.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(".tmp")
     fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
     try:
-        os.write(fd, data)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if durable:
+            os.fsync(fd)
     finally:
         os.close(fd)
     tmp.replace(path)
+    if durable:
+        _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    # Directories cannot be opened for fsync on Windows; best effort elsewhere.
+    flag = getattr(os, "O_DIRECTORY", None)
+    if flag is None:
+        return
+    try:
+        fd = os.open(str(directory), os.O_RDONLY | flag)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
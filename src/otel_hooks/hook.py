@@ -6,8 +6,8 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import os
 import sys
 import time
 from pathlib import Path
@@ -17,16 +17,17 @@ from urllib.parse import urlparse
 logger = logging.getLogger(__name__)
 
 from otel_hooks.hook_event import EventType, HookEvent
+from otel_hooks.json_codec import loads as json_loads
 from otel_hooks.tools import parse_hook_event
-from otel_hooks.domain.transcript import build_turns, decode_jsonl_lines
-from otel_hooks.providers.factory import create_provider
 from otel_hooks.runtime.state import (
     DEFAULT_STATE_DIR,
     FileLock,
+    SessionState,
     StatePaths,
     build_state_paths,
     load_session_state,
     load_state,
+    migrate_legacy_state_key,
     read_new_jsonl_lines,
     save_state,
     state_key,
@@ -127,18 +128,42 @@ def _run_attribution(turns: list, event: Any, config: dict[str, Any], provider:
 def _resolve_state_paths(config: dict[str, Any]) -> StatePaths:
     configured = config.get("state_dir")
     if configured:
-        base = Path(str(configured)).expanduser().resolve()
-        return build_state_paths(base)
+        # abspath instead of resolve(): no symlink walk on every hook call.
+        base = str(configured)
+        if base.startswith("~"):
+            base = os.path.expanduser(base)
+        return build_state_paths(Path(os.path.abspath(base)))
     return build_state_paths(DEFAULT_STATE_DIR)
 
 
+def _save_session_state_if_changed(
+    state: dict[str, Any],
+    key: str,
+    ss: SessionState,
+    prev: tuple[int, str, int],
+    state_file: Path,
+) -> None:
+    """Persist *ss* unless the entry already exists with identical values.
+
+    Most hook events add no transcript lines; skipping the rewrite avoids
+    re-serializing every tracked session while holding the lock.
+    """
+    if key in state and (ss.offset, ss.buffer, ss.turn_count) == prev:
+        return
+    write_session_state(state, key, ss)
+    save_state(state, state_file)
+
+
 def read_hook_payload() -> dict[str, Any]:
     """Read JSON payload from stdin (provided by parent AI tool process)."""
     try:
-        data = sys.stdin.read()
+        # Read raw bytes: both decoders take UTF-8 directly, so the text-layer
+        # decode (and its locale-dependent encoding) is skipped.
+        stream = getattr(sys.stdin, "buffer", sys.stdin)
+        data = stream.read()
         payload: dict[str, Any] = {}
-        if data.strip():
-            payload = json.loads(data)
+        if data and not data.isspace():
+            payload = json_loads(data)
         return payload
     except Exception:
         logger.warning("Failed to read hook payload from stdin", exc_info=True)
@@ -149,7 +174,7 @@ def run_hook(
     payload: dict[str, Any],
     config: dict[str, Any],
     *,
-    provider_factory=create_provider,
+    provider_factory=None,
 ) -> int:
     start = time.time()
     debug_enabled = bool(config.get("debug", False))
@@ -182,6 +207,11 @@ def run_hook(
             )
             return 0
 
+    # Provider SDKs and transcript parsing are imported only once we know
+    # there is work to do; no-op invocations stay cheap.
+    if provider_factory is None:
+        from otel_hooks.providers.factory import create_provider as provider_factory
+
     provider = provider_factory(provider_name, config)
     if not provider:
         logger.warning("Failed to create provider: %s", provider_name)
@@ -218,25 +248,29 @@ def run_hook(
             )
             return 0
 
+        from otel_hooks.domain.transcript import build_turns, decode_jsonl_lines
+
         with FileLock(runtime_state_paths.lock_file):
             state = load_state(runtime_state_paths.state_file)
-            key = state_key(event.session_id, str(event.transcript_path))
+            transcript = str(event.transcript_path)
+            key = state_key(event.session_id, transcript)
+            migrate_legacy_state_key(state, key, event.session_id, transcript)
             ss = load_session_state(state, key)
             prev_offset = ss.offset
             prev_buffer = ss.buffer
             prev_turn_count = ss.turn_count
 
+            prev = (prev_offset, prev_buffer, prev_turn_count)
+
             lines, ss = read_new_jsonl_lines(event.transcript_path, ss)
             if not lines:
-                write_session_state(state, key, ss)
-                save_state(state, runtime_state_paths.state_file)
+                _save_session_state_if_changed(state, key, ss, prev, runtime_state_paths.state_file)
                 return 0
 
             msgs = decode_jsonl_lines(lines)
             turns = build_turns(msgs)
             if not turns:
-                write_session_state(state, key, ss)
-                save_state(state, runtime_state_paths.state_file)
+                _save_session_state_if_changed(state, key, ss, prev, runtime_state_paths.state_file)
                 return 0
 
             emit_failed = False
@@ -263,8 +297,7 @@ def run_hook(
                 ss.turn_count = prev_turn_count
             else:
                 ss.turn_count += emitted
-            write_session_state(state, key, ss)
-            save_state(state, runtime_state_paths.state_file)
+            _save_session_state_if_changed(state, key, ss, prev, runtime_state_paths.state_file)
 
         try:
             provider.flush()
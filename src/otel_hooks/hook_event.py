@@ -6,6 +6,7 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import StrEnum
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -28,7 +29,7 @@ class HookEvent:
     context: str | None = None
     extensions: dict[str, Any] = field(default_factory=dict)
 
-    @property
+    @cached_property
     def transcript_path(self) -> Path | None:
         tp = self.data.get("transcript_path")
         if not tp:
@@ -102,6 +103,14 @@ _METRIC_EVENT_MAP: dict[str, EventType] = {
 }
 
 
+# Checked in order; the frozensets let a payload without any of them skip the loop.
+_SESSION_ID_KEYS = ("conversation_id", "sessionId", "session_id", "taskId", "thread-id")
+_SESSION_ID_KEY_SET = frozenset(_SESSION_ID_KEYS)
+_TRANSCRIPT_KEYS = ("transcriptPath", "transcript_path")
+_TRANSCRIPT_KEY_SET = frozenset(_TRANSCRIPT_KEYS)
+_TOOL_EVENTS = frozenset({EventType.TOOL_START, EventType.TOOL_END})
+
+
 def _detect_source(payload: dict[str, Any]) -> str:
     if "source_tool" in payload:
         return str(payload["source_tool"])
@@ -125,10 +134,11 @@ def _detect_source(payload: dict[str, Any]) -> str:
 
 
 def _extract_session_id(payload: dict[str, Any]) -> str:
-    for key in ("conversation_id", "sessionId", "session_id", "taskId", "thread-id"):
-        val = payload.get(key)
-        if val:
-            return str(val)
+    if not _SESSION_ID_KEY_SET.isdisjoint(payload):
+        for key in _SESSION_ID_KEYS:
+            val = payload.get(key)
+            if val:
+                return str(val)
     nested = payload.get("session")
     if isinstance(nested, dict) and "id" in nested:
         return str(nested["id"])
@@ -136,10 +146,11 @@ def _extract_session_id(payload: dict[str, Any]) -> str:
 
 
 def _extract_transcript_path(payload: dict[str, Any]) -> str | None:
-    for key in ("transcriptPath", "transcript_path"):
-        val = payload.get(key)
-        if val:
-            return str(val)
+    if not _TRANSCRIPT_KEY_SET.isdisjoint(payload):
+        for key in _TRANSCRIPT_KEYS:
+            val = payload.get(key)
+            if val:
+                return str(val)
     nested = payload.get("transcript")
     if isinstance(nested, dict) and "path" in nested:
         return str(nested["path"])
@@ -159,7 +170,7 @@ def from_legacy(payload: dict[str, Any]) -> HookEvent:
     if tp:
         data["transcript_path"] = tp
 
-    if event_type in (EventType.TOOL_START, EventType.TOOL_END):
+    if event_type in _TOOL_EVENTS:
         tool_name = payload.get("tool_name")
         if tool_name:
             data["tool_name"] = str(tool_name)
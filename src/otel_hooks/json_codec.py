@@ -0,0 +1,37 @@
+"""JSON encoding/decoding with an optional orjson fast path.
+
+orjson is optional (the ``fast`` extra); when it is importable it is used for hot-path
+decoding (transcript lines, hook payloads), for settings files and for the
+hook state file, otherwise stdlib json is used. Both raise ValueError subclasses on malformed input.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON document from str or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Encode *obj* as 2-space indented UTF-8 JSON with a trailing newline."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def dumps_compact(obj: Any) -> bytes:
+    """Encode *obj* as compact UTF-8 JSON (no whitespace between tokens)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import logging.handlers
+import os
 import sys
 from pathlib import Path
 
@@ -12,6 +13,35 @@ _LOG_BYTES = 1 * 1024 * 1024  # 1 MiB per file
 _LOG_BACKUPS = 3  # keep .log, .log.1, .log.2, .log.3
 
 
+class RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler with a cheaper per-record rollover check.
+
+    The stdlib check stats the path twice and formats every record a second
+    time just to measure it. Here the regular-file check runs whenever the
+    stream is opened, and rollover triggers once the file has reached
+    maxBytes. Each writing process may overshoot the limit by one record.
+    """
+
+    _regular_file = False
+
+    def _open(self):
+        stream = super()._open()
+        # Re-checked on every open, including the first one under delay=True.
+        self._regular_file = os.path.isfile(self.baseFilename)
+        return stream
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        if not self._regular_file:
+            return False
+        # Seek to the end first: other hook processes append to the same file.
+        self.stream.seek(0, 2)
+        return self.stream.tell() >= self.maxBytes
+
+
 def configure(log_file: Path, *, debug: bool = False, reconfigure: bool = False) -> None:
     """Attach handlers to the otel_hooks package logger.
 
@@ -28,7 +58,7 @@ def configure(log_file: Path, *, debug: bool = False, reconfigure: bool = False)
     # File handler — all levels, with rotation
     try:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        fh = logging.handlers.RotatingFileHandler(
+        fh = RotatingFileHandler(
             log_file,
             maxBytes=_LOG_BYTES,
             backupCount=_LOG_BACKUPS,
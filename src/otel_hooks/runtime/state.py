@@ -3,8 +3,8 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import logging
+import mmap
 import os
 import time
 from dataclasses import dataclass
@@ -12,6 +12,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from otel_hooks.json_codec import dumps_compact, loads as json_loads
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_STATE_DIR = Path.home() / ".config" / "otel-hooks" / "state"
@@ -73,20 +75,40 @@ class SessionState:
 
 
 def state_key(session_id: str, transcript_path: str) -> str:
+    # Only a dict key, not a security boundary: blake2b-128 is cheaper than sha256.
     raw = f"{session_id}::{transcript_path}"
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def migrate_legacy_state_key(
+    global_state: dict[str, Any], key: str, session_id: str, transcript_path: str
+) -> None:
+    """Move an entry saved under the old sha256 state key to *key*.
+
+    Without this, sessions tracked before the key change would restart at
+    offset 0 and re-emit every turn.
+    """
+    if key in global_state:
+        return
+    raw = f"{session_id}::{transcript_path}"
+    legacy = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    if legacy in global_state:
+        global_state[key] = global_state.pop(legacy)
 
 
 def load_state(state_file: Path) -> dict[str, Any]:
-    if not state_file.exists():
+    try:
+        return json_loads(state_file.read_bytes())
+    except FileNotFoundError:
         return {}
-    return json.loads(state_file.read_text(encoding="utf-8"))
 
 
 def save_state(state: dict[str, Any], state_file: Path) -> None:
     from otel_hooks.file_io import atomic_write
 
-    atomic_write(state_file, json.dumps(state, indent=2, sort_keys=True).encode("utf-8"))
+    # Compact output: the state file holds every tracked session and is
+    # rewritten on each hook run, so pretty-printing only costs time.
+    atomic_write(state_file, dumps_compact(state))
 
 
 def load_session_state(global_state: dict[str, Any], key: str) -> SessionState:
@@ -108,25 +130,37 @@ def write_session_state(global_state: dict[str, Any], key: str, ss: SessionState
 
 
 def read_new_jsonl_lines(transcript_path: Path, ss: SessionState) -> tuple[list[str], SessionState]:
-    """Read new lines from transcript file (written by external AI tools)."""
-    if not transcript_path.exists():
-        return [], ss
+    """Read new lines from transcript file (written by external AI tools).
+
+    The unread region is memory-mapped and scanned for newlines, so each
+    complete line is copied out once instead of read → decode → concat → split.
+    A trailing partial line is carried over in ``ss.buffer``.
+    """
+    lines: list[str] = []
     try:
         with open(transcript_path, "rb") as f:
-            f.seek(ss.offset)
-            chunk = f.read()
-            new_offset = f.tell()
+            if os.fstat(f.fileno()).st_size <= ss.offset:
+                return [], ss
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = len(mm)
+                pos = ss.offset
+                while True:
+                    nl = mm.find(b"\n", pos, end)
+                    if nl == -1:
+                        break
+                    lines.append(mm[pos:nl].decode("utf-8", errors="replace"))
+                    pos = nl + 1
+                tail = mm[pos:end].decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return [], ss
     except Exception:
         logger.debug("Failed to read transcript %s", transcript_path, exc_info=True)
         return [], ss
 
-    if not chunk:
-        return [], ss
-
-    text = chunk.decode("utf-8", errors="replace")
-
-    combined = ss.buffer + text
-    lines = combined.split("\n")
-    ss.buffer = lines[-1]
-    ss.offset = new_offset
-    return lines[:-1], ss
+    if lines:
+        lines[0] = ss.buffer + lines[0]
+        ss.buffer = tail
+    else:
+        ss.buffer += tail
+    ss.offset = end
+    return lines, ss
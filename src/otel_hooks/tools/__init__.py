@@ -34,21 +34,29 @@ class ToolConfig(Protocol):
 
 
 TOOL_REGISTRY: Dict[str, type[ToolConfig]] = {}
+# Tool configs are stateless façades (scope is passed per call), so one
+# instance per tool is shared by every get_tool() caller.
+_INSTANCES: Dict[str, ToolConfig] = {}
 
 
 def register_tool(cls: type[ToolConfig]) -> type[ToolConfig]:
     """Class decorator to register a tool config."""
     instance = cls()
     TOOL_REGISTRY[instance.name] = cls
+    _INSTANCES[instance.name] = instance
     return cls
 
 
 def get_tool(name: str) -> ToolConfig:
     """Get a tool config instance by name."""
     _ensure_registered()
-    if name not in TOOL_REGISTRY:
+    cls = TOOL_REGISTRY.get(name)
+    if cls is None:
         raise ValueError(f"Unknown tool: {name}. Available: {list(TOOL_REGISTRY.keys())}")
-    return TOOL_REGISTRY[name]()
+    instance = _INSTANCES.get(name)
+    if type(instance) is not cls:
+        instance = _INSTANCES[name] = cls()
+    return instance
 
 
 def available_tools() -> list[str]:
@@ -57,15 +65,22 @@ def available_tools() -> list[str]:
     return sorted(TOOL_REGISTRY.keys())
 
 
+_discovered = False
+
+
 def _ensure_registered() -> None:
     """Import all tool modules to trigger @register_tool decorators."""
-    if TOOL_REGISTRY:
+    # A non-empty registry is not enough: a single tool module may already have
+    # been imported directly (e.g. ``from .tools.codex import CodexConfig``).
+    global _discovered
+    if _discovered:
         return
     package_name = __name__
     for module in pkgutil.iter_modules(__path__):
         if module.name.startswith("_") or module.name in {"json_io"}:
             continue
         importlib.import_module(f"{package_name}.{module.name}")
+    _discovered = True
 
 
 def parse_hook_event(payload: Dict[str, Any]) -> HookEvent | None:
@@ -13,6 +13,10 @@ from .json_io import load_json, save_json
 HOOK_COMMAND = "otel-hooks hook"
 
 
+def _has_our_hook(group: Dict[str, Any], command: str = HOOK_COMMAND) -> bool:
+    return any(command in hook.get("command", "") for hook in group.get("hooks", []))
+
+
 @register_tool
 class ClaudeConfig:
     @property
@@ -36,21 +40,14 @@ class ClaudeConfig:
         save_json(self.settings_path(scope), settings)
 
     def is_hook_registered(self, settings: Dict[str, Any]) -> bool:
-        stop_hooks = settings.get("hooks", {}).get("Stop", [])
-        for group in stop_hooks:
-            for hook in group.get("hooks", []):
-                if HOOK_COMMAND in hook.get("command", ""):
-                    return True
-        return False
+        return any(_has_our_hook(group) for group in settings.get("hooks", {}).get("Stop", []))
 
     def register_hook(self, settings: Dict[str, Any], command: str | None = None) -> Dict[str, Any]:
         cmd = command or HOOK_COMMAND
         hooks = settings.setdefault("hooks", {})
         stop = hooks.setdefault("Stop", [])
-        for group in stop:
-            for hook in group.get("hooks", []):
-                if cmd in hook.get("command", ""):
-                    return settings
+        if any(_has_our_hook(group, cmd) for group in stop):
+            return settings
         stop.append({"hooks": [{"type": "command", "command": cmd, "async": True}]})
         return settings
 
@@ -58,11 +55,8 @@ class ClaudeConfig:
         stop = settings.get("hooks", {}).get("Stop", [])
         if not stop:
             return settings
-        settings["hooks"]["Stop"] = [
-            group for group in stop
-            if not any(HOOK_COMMAND in hook.get("command", "") for hook in group.get("hooks", []))
-        ]
-        if not settings["hooks"]["Stop"]:
+        stop[:] = [group for group in stop if not _has_our_hook(group)]
+        if not stop:
             del settings["hooks"]["Stop"]
         return settings
 
@@ -21,10 +21,13 @@ CONFIG_PATH = Path.home() / ".codex" / "config.toml"
 
 
 def _read_toml(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
     import tomllib
-    return tomllib.loads(path.read_text(encoding="utf-8"))
+
+    try:
+        with path.open("rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return {}
 
 
 def _write_toml(data: Dict[str, Any], path: Path) -> None:
@@ -32,7 +35,7 @@ def _write_toml(data: Dict[str, Any], path: Path) -> None:
 
     from otel_hooks.file_io import atomic_write
 
-    atomic_write(path, tomli_w.dumps(data).encode("utf-8"))
+    atomic_write(path, tomli_w.dumps(data).encode("utf-8"), durable=True)
 
 
 def _parse_headers(raw: str) -> Dict[str, str]:
@@ -107,10 +107,8 @@ class CopilotConfig:
             group = hooks.get(event_name, [])
             if not group:
                 continue
-            hooks[event_name] = [
-                hook for hook in group if "otel-hooks hook" not in hook.get("bash", "")
-            ]
-            if not hooks[event_name]:
+            group[:] = [hook for hook in group if "otel-hooks hook" not in hook.get("bash", "")]
+            if not group:
                 del hooks[event_name]
         return settings
 
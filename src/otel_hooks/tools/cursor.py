@@ -58,10 +58,8 @@ class CursorConfig:
             group = hooks.get(event, [])
             if not group:
                 continue
-            hooks[event] = [
-                h for h in group if "otel-hooks hook" not in h.get("command", "")
-            ]
-            if not hooks[event]:
+            group[:] = [h for h in group if "otel-hooks hook" not in h.get("command", "")]
+            if not group:
                 del hooks[event]
         return settings
 
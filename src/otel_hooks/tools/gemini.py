@@ -16,6 +16,10 @@ from .json_io import load_json, save_json
 HOOK_COMMAND = "otel-hooks hook"
 
 
+def _has_our_hook(group: Dict[str, Any], command: str = HOOK_COMMAND) -> bool:
+    return any(command in hook.get("command", "") for hook in group.get("hooks", []))
+
+
 @register_tool
 class GeminiConfig:
     @property
@@ -37,21 +41,14 @@ class GeminiConfig:
         save_json(self.settings_path(scope), settings)
 
     def is_hook_registered(self, settings: Dict[str, Any]) -> bool:
-        groups = settings.get("hooks", {}).get("SessionEnd", [])
-        for group in groups:
-            for hook in group.get("hooks", []):
-                if HOOK_COMMAND in hook.get("command", ""):
-                    return True
-        return False
+        return any(_has_our_hook(group) for group in settings.get("hooks", {}).get("SessionEnd", []))
 
     def register_hook(self, settings: Dict[str, Any], command: str | None = None) -> Dict[str, Any]:
         cmd = command or HOOK_COMMAND
         hooks = settings.setdefault("hooks", {})
         session_end = hooks.setdefault("SessionEnd", [])
-        for group in session_end:
-            for hook in group.get("hooks", []):
-                if cmd in hook.get("command", ""):
-                    return settings
+        if any(_has_our_hook(group, cmd) for group in session_end):
+            return settings
         session_end.append({
             "hooks": [{"type": "command", "command": cmd}],
         })
@@ -61,11 +58,8 @@ class GeminiConfig:
         groups = settings.get("hooks", {}).get("SessionEnd", [])
         if not groups:
             return settings
-        settings["hooks"]["SessionEnd"] = [
-            g for g in groups
-            if not any(HOOK_COMMAND in h.get("command", "") for h in g.get("hooks", []))
-        ]
-        if not settings["hooks"]["SessionEnd"]:
+        groups[:] = [group for group in groups if not _has_our_hook(group)]
+        if not groups:
             del settings["hooks"]["SessionEnd"]
         return settings
 
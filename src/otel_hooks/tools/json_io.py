@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any
 
 from otel_hooks.file_io import atomic_write
+from otel_hooks.json_codec import dumps_indented, loads as json_loads
 
 
 def load_json(path: Path, default: dict[str, Any] | None = None) -> dict[str, Any]:
-    if not path.exists():
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
         return default.copy() if default is not None else {}
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json_loads(raw)
 
 
 def save_json(path: Path, data: dict[str, Any]) -> None:
-    atomic_write(path, (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+    atomic_write(path, dumps_indented(data), durable=True)
@@ -59,10 +59,8 @@ class KiroConfig:
             group = hooks.get(event_name, [])
             if not group:
                 continue
-            hooks[event_name] = [
-                hook for hook in group if "otel-hooks hook" not in hook.get("command", "")
-            ]
-            if not hooks[event_name]:
+            group[:] = [hook for hook in group if "otel-hooks hook" not in hook.get("command", "")]
+            if not group:
                 del hooks[event_name]
         return settings
 
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import tests._path_setup  # noqa: F401
 
+import shutil
+import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from otel_hooks.attribution.extractor import (
     FileOp,
+    detect_repo_root,
     extract_file_ops,
+    get_git_revision,
     normalize_model,
 )
 from otel_hooks.attribution.record import (
@@ -81,6 +86,17 @@ class ExtractFileOpsTest(unittest.TestCase):
         self.assertEqual(ops[0].line_count, 3)
         self.assertEqual(ops[0].model, "anthropic/claude-sonnet-4-6")
 
+    def test_non_string_model_treated_as_unknown(self) -> None:
+        turn = _make_turn([{"name": "Write", "input": {"file_path": "/repo/a.py", "content": "x"}}], model=["bad"])
+        self.assertEqual(extract_file_ops([turn], source_tool="claude")[0].model, "unknown")
+
+    def test_write_line_count_matches_trailing_newline_rules(self) -> None:
+        cases = {"": None, "a": 1, "a\n": 1, "a\nb\n": 2, "a\nb": 2, "\n\n": 2, "a\r\nb\r\n": 2}
+        for content, expected in cases.items():
+            with self.subTest(content=content):
+                turn = _make_turn([{"name": "Write", "input": {"file_path": "/repo/f.py", "content": content}}])
+                self.assertEqual(extract_file_ops([turn])[0].line_count, expected)
+
     def test_edit_tool_extracted_no_line_count(self) -> None:
         turn = _make_turn([
             {"name": "Edit", "input": {"file_path": "/repo/src/util.py", "old_string": "x", "new_string": "y"}}
@@ -95,8 +111,10 @@ class ExtractFileOpsTest(unittest.TestCase):
             {"name": "Bash", "input": {"command": "ls -la"}},
             {"name": "Read", "input": {"file_path": "/repo/src/main.py"}},
         ])
-        ops = extract_file_ops([turn], source_tool="claude")
+        with patch("otel_hooks.attribution.extractor.Path.resolve") as resolve:
+            ops = extract_file_ops([turn], source_tool="claude")
         self.assertEqual(ops, [])
+        resolve.assert_not_called()
 
     def test_missing_file_path_skipped(self) -> None:
         turn = _make_turn([{"name": "Write", "input": {"content": "hello"}}])
@@ -110,6 +128,76 @@ class ExtractFileOpsTest(unittest.TestCase):
         self.assertEqual(len(ops), 2)
         self.assertEqual({op.abs_path.name for op in ops}, {"a.py", "b.py"})
 
+    def test_repeated_path_resolved_once(self) -> None:
+        turn = _make_turn(
+            [
+                {"name": "Write", "input": {"file_path": "/repo/a.py", "content": "x"}},
+                {"name": "Edit", "input": {"file_path": "/repo/a.py"}},
+                {"name": "Edit", "input": {"file_path": "/repo/a.py"}},
+            ]
+        )
+        with patch("otel_hooks.attribution.extractor.Path.resolve", autospec=True, side_effect=lambda p: p) as resolve:
+            ops = extract_file_ops([turn], source_tool="claude")
+        self.assertEqual(resolve.call_count, 1)
+        self.assertEqual([op.kind for op in ops], ["write", "edit", "edit"])
+        self.assertTrue(all(op.abs_path is ops[0].abs_path for op in ops))
+
+
+class DetectRepoRootTest(unittest.TestCase):
+    def test_walks_up_to_git_dir_without_subprocess(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td).resolve() / "repo"
+            (root / ".git").mkdir(parents=True)
+            (root / "src" / "pkg").mkdir(parents=True)
+            files = [root / "src" / "pkg" / "a.py", root / "src" / "pkg" / "b.py", root / "README.md"]
+
+            with patch("otel_hooks.attribution.extractor.subprocess.run") as run:
+                found = detect_repo_root(files)
+            run.assert_not_called()
+            self.assertEqual(found, root)
+
+    def test_git_file_marks_worktree_root(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td).resolve()
+            (root / ".git").write_text("gitdir: /elsewhere\n", encoding="utf-8")
+            self.assertEqual(detect_repo_root([root / "x.py"]), root)
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class GetGitRevisionTest(unittest.TestCase):
+    def _git(self, cwd: Path, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+    def _revision_without_subprocess(self, repo: Path) -> str | None:
+        with patch("otel_hooks.attribution.extractor.subprocess.run") as run:
+            revision = get_git_revision(repo)
+        run.assert_not_called()
+        return revision
+
+    def test_reads_loose_packed_worktree_and_detached_head(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            repo = Path(td) / "repo"
+            repo.mkdir()
+            self._git(repo, "init", "-q")
+            self._git(repo, "commit", "-q", "--allow-empty", "-m", "init")
+            head = self._git(repo, "rev-parse", "HEAD")
+
+            self.assertEqual(self._revision_without_subprocess(repo), head)
+
+            self._git(repo, "pack-refs", "--all")
+            self.assertEqual(self._revision_without_subprocess(repo), head)
+
+            wt = Path(td) / "wt"
+            self._git(repo, "worktree", "add", "-q", "-b", "side", str(wt))
+            self._git(wt, "commit", "-q", "--allow-empty", "-m", "side")
+            self.assertEqual(self._revision_without_subprocess(wt), self._git(wt, "rev-parse", "HEAD"))
+
+            self._git(repo, "checkout", "-q", "--detach")
+            self.assertEqual(self._revision_without_subprocess(repo), head)
+
 
 class BuildFileRecordsTest(unittest.TestCase):
     def test_write_produces_full_range(self) -> None:
@@ -128,6 +216,20 @@ class BuildFileRecordsTest(unittest.TestCase):
         records = build_file_records(ops, Path("/repo"))
         self.assertEqual(records, [])
 
+    def test_interleaved_outside_ops_skipped_and_order_kept(self) -> None:
+        ops = [
+            FileOp(Path("/repo/b.py"), "write", "m", 2),
+            FileOp(Path("/repository/x.py"), "write", "m", 9),
+            FileOp(Path("/repo/a/c.py"), "write", "m", 3),
+            FileOp(Path("/repository/x.py"), "write", "m", 9),
+            FileOp(Path("/repo/b.py"), "write", "m", 4),
+        ]
+        records = build_file_records(ops, Path("/repo"))
+        self.assertEqual(
+            [(r.path, r.conversations[0].ranges[0].end_line) for r in records],
+            [("b.py", 4), ("a/c.py", 3)],
+        )
+
     def test_unknown_model_omitted(self) -> None:
         ops = [FileOp(Path("/repo/src/foo.py"), "write", "unknown", 5)]
         records = build_file_records(ops, Path("/repo"))
@@ -142,6 +244,23 @@ class BuildFileRecordsTest(unittest.TestCase):
         records = build_file_records(ops, Path("/repo"))
         self.assertEqual(records[0].conversations[0].ranges[0].end_line, 20)
 
+    def test_edit_only_counts_lines_on_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "a.py").write_bytes(b"one\r\ntwo\nthree")
+            (root / "b.py").write_bytes(b"x\n" * 70000)
+            ops = [
+                FileOp(root / "a.py", "edit", "anthropic/model", None),
+                FileOp(root / "b.py", "edit", "anthropic/model", None),
+                FileOp(root / "gone.py", "edit", "anthropic/model", None),
+            ]
+            records = build_file_records(ops, root)
+
+        self.assertEqual(
+            {r.path: r.conversations[0].ranges[0].end_line for r in records},
+            {"a.py": 3, "b.py": 70000},
+        )
+
 
 class TraceRecordSerializationTest(unittest.TestCase):
     def test_to_dict_minimal(self) -> None:
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import tempfile
 import tests._path_setup  # noqa: F401
 import unittest
+from contextlib import contextmanager
 from pathlib import Path
-from unittest.mock import patch
+from typing import Iterator
+from unittest.mock import MagicMock, patch
 
 from otel_hooks import cli
 from otel_hooks.tools import Scope
@@ -66,6 +71,30 @@ def _args(
     )
 
 
+@contextmanager
+def _settings_tree() -> Iterator[Path]:
+    """Run with an empty temp dir as both the home and the working directory."""
+    before = Path.cwd()
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        os.chdir(root)
+        try:
+            with patch.object(Path, "home", return_value=root), patch.dict(os.environ, {}, clear=True):
+                yield root
+        finally:
+            os.chdir(before)
+
+
+def _write_json(path: Path, data: dict[str, object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def _claude_hook(provider: str) -> dict[str, object]:
+    command = f"otel-hooks hook --provider {provider}"
+    return {"hooks": {"Stop": [{"hooks": [{"type": "command", "command": command}]}]}}
+
+
 class CliBehaviorTest(unittest.TestCase):
     def test_cmd_enable_registers_hook_and_writes_provider_config(self) -> None:
         tool = _StubTool(scopes=[Scope.PROJECT])
@@ -89,13 +118,42 @@ class CliBehaviorTest(unittest.TestCase):
         self.assertNotIn("provider", saved_cfg["data"])
         self.assertNotIn("enabled", saved_cfg["data"])
 
+    def test_enable_one_shows_spinner_only_on_a_terminal_console(self) -> None:
+        for is_terminal in (False, True):
+            tool = _StubTool(scopes=[Scope.PROJECT])
+            with self.subTest(is_terminal=is_terminal), patch("otel_hooks.cli.get_tool", return_value=tool), patch(
+                "otel_hooks.cli.console"
+            ) as console:
+                console.is_terminal = is_terminal
+                rc = cli._enable_one("claude", _args(), providers=["otlp"], show_status=True)
+
+                self.assertEqual(rc, 0)
+                self.assertEqual(tool.register_called, 1)
+                self.assertEqual(console.status.called, is_terminal)
+
+    def test_cmd_enable_resolves_each_tool_and_scope_once(self) -> None:
+        tool = _StubTool(scopes=[Scope.PROJECT])
+        with patch("otel_hooks.cli.get_tool", return_value=tool) as lookup, patch(
+            "otel_hooks.cli.cfg.load_raw_config", return_value={}
+        ), patch("otel_hooks.cli.cfg.env_keys_for_provider", return_value=[]), patch(
+            "otel_hooks.cli.cfg.save_config"
+        ), patch("otel_hooks.cli._resolve_scope", wraps=cli._resolve_scope) as resolve, patch.object(
+            cli.console, "print"
+        ):
+            rc = cli.cmd_enable(_args())
+
+        self.assertEqual(rc, 0)
+        resolve.assert_called_once()
+        lookup.assert_called_once_with("claude")
+        self.assertEqual(tool.saved[-1][1], Scope.PROJECT)
+
     def test_cmd_enable_all_writes_provider_config_once(self) -> None:
         claude = _StubTool(scopes=[Scope.PROJECT])
         cursor = _StubTool(scopes=[Scope.PROJECT])
         tools = {"claude": claude, "cursor": cursor}
         save_calls: list[tuple[dict[str, object], Scope]] = []
 
-        with patch("otel_hooks.cli.TOOLS", ["claude", "cursor"]), patch(
+        with patch("otel_hooks.cli._tools", return_value=cli._ToolList.of(["claude", "cursor"])), patch(
             "otel_hooks.cli.get_tool",
             side_effect=lambda name: tools[name],
         ), patch("otel_hooks.cli.cfg.load_raw_config", return_value={}), patch(
@@ -113,6 +171,141 @@ class CliBehaviorTest(unittest.TestCase):
         self.assertEqual(save_calls[0][1], Scope.PROJECT)
         self.assertNotIn("provider", save_calls[0][0])
 
+    def test_cmd_enable_multiple_providers_saves_each_scope_once(self) -> None:
+        tool = _StubTool(scopes=[Scope.PROJECT])
+        save_calls: list[tuple[dict[str, object], Scope]] = []
+
+        with patch("otel_hooks.cli.get_tool", return_value=tool), patch(
+            "otel_hooks.cli.cfg.load_raw_config", return_value={}
+        ) as load_raw, patch("otel_hooks.cli.cfg.load_config", return_value={}) as load_config, patch(
+            "otel_hooks.cli.cfg.env_keys_for_provider", side_effect=lambda p: (cli.cfg.ProviderKey(p, p.upper()),)
+        ), patch("otel_hooks.cli._collect_env", side_effect=lambda keys, **_: {k.field: "v" for k in keys}), patch(
+            "otel_hooks.cli.cfg.save_config",
+            side_effect=lambda data, scope: save_calls.append((data, scope)),
+        ):
+            rc = cli.cmd_enable(_args(provider=["otlp", "datadog"]))
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(len(save_calls), 1)
+        self.assertEqual(save_calls[0][0], {"otlp": {"otlp": "v"}, "datadog": {"datadog": "v"}})
+        load_raw.assert_called_once()
+        load_config.assert_called_once()
+
+    def test_run_tool_actions_stays_sequential_below_threshold(self) -> None:
+        import threading
+
+        callers: set[str] = set()
+
+        def action(name: str) -> int:
+            callers.add(threading.current_thread().name)
+            return 0
+
+        rc = cli._run_tool_actions(["a", "b", "c"], action, failure_label="check", parallel=True)
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(callers, {threading.current_thread().name})
+
+    def test_run_tool_actions_fail_fast_stops_after_first_failure(self) -> None:
+        seen: list[str] = []
+
+        def action(name: str) -> int:
+            seen.append(name)
+            return 1 if name == "a" else 0
+
+        rc = cli._run_tool_actions(["a", "b"], action, failure_label="check", parallel=False, fail_fast=True)
+
+        self.assertEqual(rc, 1)
+        self.assertEqual(seen, ["a"])
+
+    def test_run_tool_actions_pooled_reports_failures_in_tool_order(self) -> None:
+        import threading
+
+        d_failed = threading.Event()
+
+        def action(name: str) -> int:
+            if name == "a":
+                d_failed.wait(5)
+                raise RuntimeError("boom-a")
+            if name == "d":
+                d_failed.set()
+                raise RuntimeError("boom-d")
+            return 0
+
+        with patch.object(cli.console, "print") as printed:
+            rc = cli._run_tool_actions(["a", "b", "c", "d"], action, failure_label="check", parallel=True)
+
+        self.assertEqual(rc, 1)
+        self.assertEqual(
+            [c.args[0] for c in printed.call_args_list],
+            [
+                "[yellow]Warning:[/yellow] failed to check a: boom-a",
+                "[yellow]Warning:[/yellow] failed to check d: boom-d",
+            ],
+        )
+
+    def test_run_tool_actions_shuts_down_its_workers_before_returning(self) -> None:
+        import threading
+
+        workers: set[threading.Thread] = set()
+
+        def action(name: str) -> int:
+            workers.add(threading.current_thread())
+            return 0
+
+        rc = cli._run_tool_actions(["a", "b", "c", "d"], action, failure_label="check", parallel=True)
+
+        self.assertEqual(rc, 0)
+        self.assertNotIn(threading.current_thread(), workers)
+        self.assertFalse(any(t.is_alive() for t in workers))
+
+    def test_run_tool_actions_pooled_fail_fast_joins_workers(self) -> None:
+        import threading
+
+        workers: set[threading.Thread] = set()
+        lock = threading.Lock()
+
+        def action(name: str) -> int:
+            with lock:
+                workers.add(threading.current_thread())
+            return 1 if name == "a" else 0
+
+        with patch.object(cli.console, "print") as printed:
+            rc = cli._run_tool_actions(
+                ["a", "b", "c", "d"], action, failure_label="check", parallel=True, fail_fast=True
+            )
+
+        self.assertEqual(rc, 1)
+        printed.assert_not_called()
+        self.assertFalse(any(t.is_alive() for t in workers))
+
+    def test_write_provider_config_skips_known_fields_and_project_secrets(self) -> None:
+        saved: dict[str, object] = {}
+        with patch("otel_hooks.cli.cfg.load_raw_config", return_value={"langfuse": {"public_key": "pk"}}), patch(
+            "otel_hooks.cli.cfg.load_config", return_value={"langfuse": {"base_url": "https://lf"}}
+        ), patch("otel_hooks.cli._collect_env", return_value={}) as collect, patch(
+            "otel_hooks.cli.cfg.save_config", side_effect=lambda data, scope: saved.update(data)
+        ), patch.object(cli.console, "print"):
+            cli._write_provider_config_for_scope(
+                providers=["langfuse"], config_scope=Scope.PROJECT, skip_project_secrets=True
+            )
+
+        collect.assert_called_once_with([], from_stdin=False)
+        self.assertEqual(saved, {"langfuse": {"public_key": "pk"}})
+
+    def test_write_provider_config_uses_callers_merged_config(self) -> None:
+        with _settings_tree() as root, patch(
+            "otel_hooks.cli._collect_env", side_effect=lambda keys, **_: {k.field: "prompted" for k in keys}
+        ):
+            cli._write_provider_config_for_scope(
+                providers=["otlp"],
+                config_scope=Scope.PROJECT,
+                skip_project_secrets=False,
+                merged={"otlp": {"endpoint": "http://collector:4318"}},
+            )
+
+            saved = json.loads((root / ".otel-hooks.json").read_text(encoding="utf-8"))
+        self.assertNotIn("endpoint", saved["otlp"])
+
     def test_cmd_disable_unregisters_hook_without_touching_otel_config(self) -> None:
         tool = _StubTool(registered=True, scopes=[Scope.PROJECT])
 
@@ -152,7 +345,7 @@ class CliBehaviorTest(unittest.TestCase):
         tools = {"claude": claude, "cursor": cursor}
         save_calls: list[tuple[dict[str, object], Scope]] = []
 
-        with patch("otel_hooks.cli.TOOLS", ["claude", "cursor"]), patch(
+        with patch("otel_hooks.cli._tools", return_value=cli._ToolList.of(["claude", "cursor"])), patch(
             "otel_hooks.cli.get_tool",
             side_effect=lambda name: tools[name],
         ), patch("otel_hooks.cli.cfg.load_config", return_value={}), patch(
@@ -170,6 +363,47 @@ class CliBehaviorTest(unittest.TestCase):
         self.assertEqual(save_calls[0][1], Scope.PROJECT)
         self.assertNotIn("provider", save_calls[0][0])
 
+    def test_doctor_one_checks_providers_registered_in_every_scope(self) -> None:
+        with _settings_tree() as root:
+            _write_json(root / ".claude" / "settings.json", _claude_hook("langfuse"))
+            _write_json(root / ".claude" / "settings.local.json", _claude_hook("otlp"))
+            _write_json(
+                root / ".config" / "otel-hooks" / "config.json",
+                {"langfuse": {"public_key": "pk", "secret_key": "sk"}},
+            )
+            before = {p: p.read_bytes() for p in root.rglob("*.json")}
+
+            with patch("otel_hooks.cli._confirm", return_value=False), patch.object(cli.console, "print") as printed:
+                rc = cli._doctor_one("claude", _args(project=False))
+
+            self.assertEqual(rc, 1)
+            output = "\n".join(str(c.args[0]) for c in printed.call_args_list)
+            self.assertIn("otlp.endpoint not set", output)
+            self.assertNotIn("langfuse", output)
+            self.assertEqual({p: p.read_bytes() for p in root.rglob("*.json")}, before)
+
+    def test_doctor_one_registers_missing_hook_once_in_primary_scope(self) -> None:
+        with _settings_tree() as root:
+            settings_path = root / ".claude" / "settings.json"
+            args = _args(provider="otlp", yes=True)
+
+            with patch.object(cli.console, "print"):
+                rc = cli._doctor_one("claude", args, fix_provider_config=False)
+            self.assertEqual(rc, 0)
+            written = settings_path.read_bytes()
+            commands = [
+                hook["command"]
+                for group in json.loads(written)["hooks"]["Stop"]
+                for hook in group["hooks"]
+            ]
+            self.assertEqual(len(commands), 1)
+            self.assertIn("otel-hooks hook --provider otlp", commands[0])
+            self.assertFalse((root / ".claude" / "settings.local.json").exists())
+
+            with patch.object(cli.console, "print"):
+                cli._doctor_one("claude", args, include_provider_checks=False)
+            self.assertEqual(settings_path.read_bytes(), written)
+
     def test_doctor_fixes_via_tui_confirm(self) -> None:
         tool = _StubTool(registered=False, scopes=[Scope.PROJECT])
         saved_cfg: dict[str, object] = {}
@@ -215,6 +449,326 @@ class CliBehaviorTest(unittest.TestCase):
             with self.assertRaises(SystemExit):
                 cli._resolve_provider(_args(provider=None))
 
+    def test_parse_args_builds_only_selected_subcommand(self) -> None:
+        with patch("otel_hooks.cli._build_parser") as full_parser:
+            args = cli._parse_args(["hook", "--provider", "otlp", "--tool", "claude"])
+
+        full_parser.assert_not_called()
+        self.assertEqual(args.command, "hook")
+        self.assertEqual(args.provider, "otlp")
+        self.assertEqual(args.tool, "claude")
+
+    def test_parse_args_enable_accepts_scope_and_attribution_flags(self) -> None:
+        args = cli._parse_args(["enable", "--project", "--provider", "otlp", "datadog", "--no-attribution"])
+
+        self.assertEqual(args.command, "enable")
+        self.assertTrue(args.project)
+        self.assertEqual(args.provider, ["otlp", "datadog"])
+        self.assertFalse(args.attribution)
+
+    def test_parse_args_disable_fail_fast_is_opt_in(self) -> None:
+        self.assertFalse(cli._parse_args(["disable", "--tool", "claude"]).fail_fast)
+        self.assertTrue(cli._parse_args(["disable", "--tool", "claude", "--fail-fast"]).fail_fast)
+
+    def test_full_parser_shares_scope_and_tool_flags(self) -> None:
+        parser = cli._build_parser()
+
+        args = parser.parse_args(["doctor", "--local", "--tool", "cursor", "-y"])
+        self.assertTrue(args.local)
+        self.assertEqual(args.tool, "cursor")
+        self.assertTrue(args.yes)
+        with patch("sys.stderr"), self.assertRaises(SystemExit):
+            parser.parse_args(["status", "--global", "--project"])
+
+    def test_parse_args_validates_tool_without_enumerating_at_build(self) -> None:
+        cli._tools.cache_clear()
+        self.addCleanup(cli._tools.cache_clear)
+        with patch("otel_hooks.cli.available_tools", return_value=["claude", "cursor"]) as available:
+            cli._parse_args(["status"])
+            available.assert_not_called()
+
+            self.assertEqual(cli._parse_args(["status", "--tool", "all"]).tool, "all")
+            self.assertEqual(cli._parse_args(["status", "--tool", "cursor"]).tool, "cursor")
+            with patch("sys.stderr"), self.assertRaises(SystemExit):
+                cli._parse_args(["status", "--tool", "vim"])
+        available.assert_called_once()
+
+    def test_tools_are_discovered_once_per_process(self) -> None:
+        cli._tools.cache_clear()
+        self.addCleanup(cli._tools.cache_clear)
+        with patch("otel_hooks.cli.available_tools", return_value=["claude", "cursor"]) as available:
+            self.assertEqual(cli._tools().names, ("claude", "cursor"))
+            self.assertIs(cli._tools(), cli._tools())
+        available.assert_called_once()
+
+    def test_tool_list_derives_members_and_menu_choices(self) -> None:
+        tools = cli._ToolList.of(["claude", "kiro"])
+
+        self.assertEqual(tools.names, ("claude", "kiro"))
+        self.assertEqual(tools.members, frozenset({"claude", "kiro"}))
+        self.assertEqual(tools.choices, ("claude", "kiro", "all"))
+
+    def test_resolve_tools_all_uses_patched_tool_list(self) -> None:
+        with patch("otel_hooks.cli._tools", return_value=cli._ToolList.of(["claude", "kiro"])):
+            self.assertEqual(cli._resolve_tools(_args(tool="all")), ["claude", "kiro"])
+
+    def test_main_runs_hook_without_building_a_parser(self) -> None:
+        with patch("sys.argv", ["otel-hooks", "hook", "--provider", "otlp"]), patch(
+            "otel_hooks.hook.main", return_value=0
+        ) as hook_main, patch("otel_hooks.cli._parse_args") as parse_args, self.assertRaises(SystemExit) as ctx:
+            cli.main()
+
+        self.assertEqual(ctx.exception.code, 0)
+        hook_main.assert_called_once_with()
+        parse_args.assert_not_called()
+
+    def test_main_runs_version_without_building_a_parser(self) -> None:
+        with patch("sys.argv", ["otel-hooks", "version"]), patch(
+            "otel_hooks.cli.cmd_version", return_value=0
+        ) as handler, patch("otel_hooks.cli._parse_args") as parse_args, self.assertRaises(SystemExit) as ctx:
+            cli.main()
+
+        self.assertEqual(ctx.exception.code, 0)
+        handler.assert_called_once()
+        parse_args.assert_not_called()
+
+    def test_main_hook_help_still_uses_argparse(self) -> None:
+        with patch("sys.argv", ["otel-hooks", "hook", "--help"]), patch(
+            "otel_hooks.hook.main"
+        ) as hook_main, patch("sys.stdout"), self.assertRaises(SystemExit):
+            cli.main()
+
+        hook_main.assert_not_called()
+
+    def test_main_dispatches_to_selected_command(self) -> None:
+        for command in ("status", "enable", "disable", "doctor", "version"):
+            with self.subTest(command=command), patch("sys.argv", ["otel-hooks", command]), patch(
+                f"otel_hooks.cli.cmd_{command}", return_value=3
+            ) as handler, self.assertRaises(SystemExit) as ctx:
+                cli.main()
+            handler.assert_called_once()
+            self.assertEqual(ctx.exception.code, 3)
+
+    def test_parse_args_without_command_prints_help(self) -> None:
+        with patch("sys.stdout"), self.assertRaises(SystemExit) as ctx:
+            cli._parse_args([])
+
+        self.assertEqual(ctx.exception.code, 0)
+
+    def test_cmd_status_resolves_each_settings_path_once(self) -> None:
+        class _CountingTool(_StubTool):
+            def __init__(self) -> None:
+                super().__init__(scopes=[Scope.GLOBAL, Scope.PROJECT])
+                self.path_calls = 0
+
+            def settings_path(self, scope: Scope) -> Path:
+                self.path_calls += 1
+                return Path(f"/nonexistent/otel-hooks-status/{scope.value}.json")
+
+            def load_settings(self, scope: Scope) -> dict[str, object]:
+                return {"hooks": {"Stop": [{"command": "otel-hooks hook --provider otlp"}]}}
+
+        tool = _CountingTool()
+        with patch("otel_hooks.cli._tools", return_value=cli._ToolList.of(["stub"])), patch(
+            "otel_hooks.cli.get_tool", return_value=tool
+        ), patch("otel_hooks.cli.cfg.load_config", return_value={}) as load_config, patch(
+            "otel_hooks.cli.cfg.env_keys_for_provider", return_value=[]
+        ), patch.object(cli.console, "print"):
+            rc = cli.cmd_status(_args(tool="all"))
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(tool.path_calls, 2)
+        load_config.assert_called_once()
+
+    def test_collect_env_reads_piped_values_once_with_stdin_flag(self) -> None:
+        import io
+
+        stdin = io.StringIO("OTEL_EXPORTER_OTLP_ENDPOINT=http://collector:4318\nignored line\nDD_ENV = prod\n")
+        with patch("otel_hooks.cli._stdin_env", None), patch("sys.stdin", stdin), patch("otel_hooks.cli._text") as text:
+            otlp = cli._collect_env(cli.cfg.env_keys_for_provider("otlp"), from_stdin=True)
+            datadog = cli._collect_env([cli.cfg.ProviderKey("env", "DD_ENV")], from_stdin=True)
+
+        text.assert_not_called()
+        self.assertEqual(otlp, {"endpoint": "http://collector:4318"})
+        self.assertEqual(datadog, {"env": "prod"})
+
+    def test_collect_env_prompts_without_stdin_flag_even_without_tty(self) -> None:
+        stdin = MagicMock()
+        with patch("otel_hooks.cli._is_tty", return_value=False), patch("sys.stdin", stdin), patch(
+            "otel_hooks.cli._text", return_value="http://c:4318"
+        ):
+            values = cli._collect_env(cli.cfg.env_keys_for_provider("otlp")[:1])
+
+        self.assertEqual(values, {"endpoint": "http://c:4318"})
+        stdin.read.assert_not_called()
+
+    def test_collect_env_prompts_secret_keys_without_echo(self) -> None:
+        with patch("otel_hooks.cli._text", return_value="pk") as text, patch(
+            "otel_hooks.cli._password", return_value="sk"
+        ) as password:
+            values = cli._collect_env(cli.cfg.env_keys_for_provider("langfuse")[:2])
+
+        self.assertEqual(values, {"public_key": "pk", "secret_key": "sk"})
+        text.assert_called_once_with("LANGFUSE_PUBLIC_KEY:")
+        password.assert_called_once_with("LANGFUSE_SECRET_KEY:")
+
+    def test_enable_codex_prompts_for_langfuse_base_url_with_default(self) -> None:
+        import tempfile
+
+        from otel_hooks.tools import codex
+
+        prompts: list[tuple[str, str]] = []
+
+        def _text(message: str, *, default: str = "", flag: str = "") -> str:
+            prompts.append((message, default))
+            return default or "pk"
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.toml"
+            with patch.object(codex, "CONFIG_PATH", path), patch(
+                "otel_hooks.cli.cfg.load_config", return_value={}
+            ), patch("otel_hooks.cli._text", side_effect=_text), patch(
+                "otel_hooks.cli._password", return_value="sk"
+            ), patch.object(cli.console, "print"):
+                rc = cli._enable_codex(argparse.Namespace(provider="langfuse"))
+
+            written = codex._read_toml(path)
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(
+            prompts, [("LANGFUSE_PUBLIC_KEY:", ""), ("LANGFUSE_BASE_URL:", "https://cloud.langfuse.com")]
+        )
+        endpoint = written["otel"]["exporter"]["otlp-http"]["endpoint"]
+        self.assertTrue(endpoint.startswith("https://cloud.langfuse.com/"))
+
+    def test_enable_codex_with_stdin_flag_reads_piped_keys(self) -> None:
+        import io
+        import tempfile
+
+        from otel_hooks.tools import codex
+
+        stdin = io.StringIO("OTEL_EXPORTER_OTLP_ENDPOINT=http://collector:4318\n")
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.toml"
+            with patch.object(codex, "CONFIG_PATH", path), patch(
+                "otel_hooks.cli.cfg.load_config", return_value={}
+            ), patch("otel_hooks.cli._stdin_env", None), patch("sys.stdin", stdin), patch(
+                "otel_hooks.cli._text"
+            ) as text, patch.object(cli.console, "print"):
+                rc = cli._enable_codex(argparse.Namespace(provider="otlp", stdin=True))
+
+            written = codex._read_toml(path)
+
+        self.assertEqual(rc, 0)
+        text.assert_not_called()
+        self.assertEqual(written["otel"]["exporter"]["otlp-http"]["endpoint"], "http://collector:4318")
+
+    def test_cmd_status_renders_one_row_per_tool_in_order(self) -> None:
+        class _ProviderTool(_StubTool):
+            def __init__(self, provider: str) -> None:
+                super().__init__(registered=True)
+                self.provider = provider
+
+            def load_settings(self, scope: Scope) -> dict[str, object]:
+                return {"registered": True, "hooks": {"Stop": [{"command": f"otel-hooks hook --provider {self.provider}"}]}}
+
+        tools = {"a": _ProviderTool("otlp"), "b": _ProviderTool("datadog"), "c": _ProviderTool("langfuse")}
+        with patch("otel_hooks.cli._tools", return_value=cli._ToolList.of(["a", "b", "c"])), patch(
+            "otel_hooks.cli.get_tool", side_effect=lambda name: tools[name]
+        ), patch("otel_hooks.cli.cfg.load_config", return_value={}), patch.object(cli.console, "print") as printed:
+            rc = cli.cmd_status(_args(tool="all"))
+
+        self.assertEqual(rc, 0)
+        printed.assert_called_once()
+        table = printed.call_args.args[0].renderables[0]
+        self.assertEqual(list(table.columns[0].cells), ["a", "b", "c"])
+        self.assertEqual(list(table.columns[3].cells), ["otlp", "datadog", "langfuse"])
+
+    def test_mask_hides_short_secrets_and_keeps_long_ends(self) -> None:
+        self.assertEqual(cli._mask("sk-12345"), "***")
+        self.assertEqual(cli._mask("sk-lf-0123456789"), "sk-l...6789")
+
+    def test_migrate_env_var_and_provider_extraction(self) -> None:
+        settings = {
+            "hooks": {
+                "Stop": [
+                    {"command": "OTEL_HOOKS_SOURCE_TOOL=cursor otel-hooks hook --provider otlp"},
+                    {"hooks": [{"command": "otel-hooks hook"}]},
+                ]
+            }
+        }
+        cli._migrate_env_var_to_tool_flag(settings, "cursor")
+
+        self.assertEqual(settings["hooks"]["Stop"][0]["command"], "otel-hooks hook --provider otlp --tool cursor")
+        self.assertEqual(cli._providers_in_settings(settings), ["otlp", "(default)"])
+
+    def test_importing_cli_defers_prompt_and_console_modules(self) -> None:
+        import os
+        import subprocess
+        import sys
+
+        from tests._path_setup import SRC
+
+        code = (
+            "import sys, otel_hooks.cli; "
+            "print([m for m in ('questionary', 'rich.console', 'concurrent.futures') if m in sys.modules])"
+        )
+        env = {**os.environ, "PYTHONPATH": str(SRC)}
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_iter_hook_commands_walks_flat_and_nested_hooks_lazily(self) -> None:
+        settings = {
+            "hooks": {
+                "Stop": [{"command": "a", "hooks": [{"command": "b"}, "junk", {"command": ""}]}, "junk"],
+                "version": 1,
+                "afterFileEdit": [{"command": "c"}],
+            }
+        }
+        commands = cli._iter_hook_commands(settings)
+
+        self.assertEqual(next(commands), "a")
+        self.assertEqual(list(commands), ["b", "c"])
+
+    def test_runner_prefix_probes_path_once_per_process(self) -> None:
+        cli._detect_runner_prefix.cache_clear()
+        self.addCleanup(cli._detect_runner_prefix.cache_clear)
+        with patch("sys.argv", ["/usr/local/bin/otel-hooks"]), patch(
+            "shutil.which", side_effect=lambda name: None if name == "otel-hooks" else "/usr/bin/uvx"
+        ) as which:
+            commands = [cli._hook_command_for_provider(p) for p in ("otlp", "datadog")]
+
+        self.assertTrue(all(c.startswith("uvx ") for c in commands))
+        self.assertEqual(which.call_count, 2)
+
+    def test_is_tty_checks_stdin_once_per_process(self) -> None:
+        cli._is_tty.cache_clear()
+        self.addCleanup(cli._is_tty.cache_clear)
+        stdin = MagicMock()
+        stdin.isatty.return_value = True
+        with patch("sys.stdin", stdin):
+            self.assertTrue(cli._is_tty())
+            self.assertTrue(cli._is_tty())
+
+        stdin.isatty.assert_called_once()
+
+    def test_clone_args_overrides_without_touching_original(self) -> None:
+        args = _args(provider="otlp")
+        clone = cli._clone_args(args, provider="datadog", yes=True)
+
+        self.assertEqual((clone.provider, clone.yes, clone.tool), ("datadog", True, "claude"))
+        self.assertEqual((args.provider, args.yes), ("otlp", False))
+
+    def test_cmd_version_prints_installed_version(self) -> None:
+        with patch("importlib.metadata.version", return_value="9.9.9") as version, patch.object(
+            cli.console, "print"
+        ) as printed:
+            rc = cli.cmd_version(_args())
+
+        self.assertEqual(rc, 0)
+        version.assert_called_once_with("otel-hooks")
+        printed.assert_called_once_with("9.9.9")
+
 
 if __name__ == "__main__":
     unittest.main()
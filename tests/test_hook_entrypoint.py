@@ -38,6 +38,18 @@ class HookEntrypointTest(unittest.TestCase):
 
         self.assertNotIn("source_tool", payload)
 
+    def test_read_hook_payload_reads_utf8_bytes_from_buffer(self) -> None:
+        stdin = io.TextIOWrapper(io.BytesIO('{"cwd": "/tmp/日本"}'.encode("utf-8")), encoding="latin-1")
+        with patch("sys.stdin", stdin):
+            payload = read_hook_payload()
+
+        self.assertEqual(payload, {"cwd": "/tmp/日本"})
+
+    def test_read_hook_payload_whitespace_only_is_empty(self) -> None:
+        stdin = io.TextIOWrapper(io.BytesIO(b" \n\t"))
+        with patch("sys.stdin", stdin):
+            self.assertEqual(read_hook_payload(), {})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ import tests._path_setup  # noqa: F401
 import unittest
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 from otel_hooks import hook
 
@@ -129,11 +130,23 @@ class HookIntegrationTest(unittest.TestCase):
 
             state_file = root / "state" / "otel_hook_state.json"
             self.assertTrue(state_file.exists())
+            # 変化のない再実行では state を書き直さない
+            with patch("otel_hooks.hook.save_state") as save_state:
+                hook.run_hook(payload, config, provider_factory=lambda _name, _cfg: _StubProvider())
+            save_state.assert_not_called()
             state = json.loads(state_file.read_text(encoding="utf-8"))
             self.assertEqual(len(state), 1)
             saved = next(iter(state.values()))
             self.assertEqual(saved["turn_count"], 1)
 
+    def test_resolve_state_paths_expands_home_and_relative_dirs(self) -> None:
+        with tempfile.TemporaryDirectory() as td, patch.dict("os.environ", {"HOME": td}):
+            paths = hook._resolve_state_paths({"state_dir": "~/state"})
+            self.assertEqual(paths.state_file, Path(td) / "state" / "otel_hook_state.json")
+
+        paths = hook._resolve_state_paths({"state_dir": "rel"})
+        self.assertTrue(paths.state_dir.is_absolute())
+
     def test_run_hook_emits_metrics_for_metrics_only_event(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -169,6 +182,18 @@ class HookIntegrationTest(unittest.TestCase):
 
             self.assertEqual(rc, 1)
 
+    def test_run_hook_without_provider_exits_before_creating_provider(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            payload = {"hook_event_name": "PreToolUse", "tool_name": "bash", "cwd": str(root)}
+            config = {"debug": False, "state_dir": str(root / "state")}
+            calls: list[str] = []
+
+            rc = hook.run_hook(payload, config, provider_factory=lambda name, _cfg: calls.append(name))
+
+            self.assertEqual(rc, 0)
+            self.assertEqual(calls, [])
+
     def test_run_hook_flushes_and_shuts_down_when_metric_emit_fails(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
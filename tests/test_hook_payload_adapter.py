@@ -374,6 +374,28 @@ class HookPayloadAdapterTest(unittest.TestCase):
         self.assertEqual(event.source, "cline")
         self.assertEqual(event.session_id, "t99")
 
+    def test_parse_hook_event_marker_precedence(self) -> None:
+        cases = [
+            ({"thread-id": "x", "sessionId": "s", "hook_event_name": "Stop"}, "codex"),
+            ({"taskId": "t", "thread-id": "x", "conversation_id": "c"}, "cursor"),
+            ({"hook_event_name": "stop", "sessionId": "s"}, "kiro"),
+            ({"hook_event_name": "Stop", "transcriptPath": "./t.jsonl"}, "copilot"),
+            ({"source_tool": "opencode", "conversation_id": "c"}, "opencode"),
+        ]
+        for payload, source in cases:
+            with self.subTest(source=source):
+                self.assertEqual(parse_hook_event(payload).source, source)
+
+    def test_parse_hook_event_reads_nested_session_and_transcript(self) -> None:
+        payload = {
+            "source_tool": "opencode",
+            "session": {"id": "oc-1"},
+            "transcript": {"path": "./oc.jsonl"},
+        }
+        event = parse_hook_event(payload)
+        self.assertEqual(event.session_id, "oc-1")
+        self.assertEqual(event.transcript_path.name, "oc.jsonl")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import tests._path_setup  # noqa: F401
+
+import unittest
+from unittest.mock import patch
+
+from otel_hooks import json_codec
+
+_SAMPLE = {
+    "hooks": {
+        "Stop": [{"hooks": [{"type": "command", "command": "otel-hooks hook --provider otlp", "async": True}]}],
+        "empty": [],
+    },
+    "otlp": {"endpoint": "http://collector:4318", "headers": {}},
+    "note": "ü 日本語 \"quoted\" \\ back\nslash",
+    "count": 3,
+    "ratio": 0.5,
+    "enabled": False,
+    "missing": None,
+}
+
+
+@unittest.skipUnless(json_codec.orjson, "orjson is not installed")
+class OrjsonParityTest(unittest.TestCase):
+    def _stdlib(self, encode, obj):
+        with patch("otel_hooks.json_codec.orjson", None):
+            return encode(obj)
+
+    def test_dumps_indented_matches_stdlib_bytes(self) -> None:
+        for obj in (_SAMPLE, {}, []):
+            with self.subTest(obj=obj):
+                self.assertEqual(json_codec.dumps_indented(obj), self._stdlib(json_codec.dumps_indented, obj))
+
+    def test_dumps_compact_matches_stdlib_bytes(self) -> None:
+        for obj in (_SAMPLE, {}, []):
+            with self.subTest(obj=obj):
+                self.assertEqual(json_codec.dumps_compact(obj), self._stdlib(json_codec.dumps_compact, obj))
+
+    def test_loads_matches_stdlib(self) -> None:
+        raw = self._stdlib(json_codec.dumps_indented, _SAMPLE)
+        with patch("otel_hooks.json_codec.orjson", None):
+            expected = json_codec.loads(raw)
+        self.assertEqual(json_codec.loads(raw), expected)
+        self.assertEqual(json_codec.loads(raw.decode("utf-8")), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,18 +9,23 @@ from unittest.mock import patch
 
 import pytest
 
-from otel_hooks.logging_setup import configure, _PACKAGE
+from otel_hooks.logging_setup import RotatingFileHandler, configure, _PACKAGE
 
 
 @pytest.fixture(autouse=True)
 def _clean_logger():
     """Reset the package logger between tests."""
+    # configure() turns propagation off, which makes pytest's logging plugin
+    # attach its capture handlers directly to this logger in later tests.
+    def reset() -> None:
+        pkg.handlers.clear()
+        pkg.setLevel(logging.WARNING)
+        pkg.propagate = True
+
     pkg = logging.getLogger(_PACKAGE)
-    pkg.handlers.clear()
-    pkg.setLevel(logging.WARNING)
+    reset()
     yield
-    pkg.handlers.clear()
-    pkg.setLevel(logging.WARNING)
+    reset()
 
 
 class TestConfigure:
@@ -84,3 +89,39 @@ class TestConfigure:
         configure(tmp_path / "test.log")
         pkg = logging.getLogger(_PACKAGE)
         assert pkg.propagate is False
+
+    def test_rollover_checks_size_without_reformatting(self, tmp_path: Path):
+        log_file = tmp_path / "test.log"
+        with patch("otel_hooks.logging_setup._LOG_BYTES", 64):
+            configure(log_file, debug=True)
+        fh = next(h for h in logging.getLogger(_PACKAGE).handlers if isinstance(h, logging.FileHandler))
+        test_logger = logging.getLogger(f"{_PACKAGE}.test_module")
+        with patch.object(fh, "format", wraps=fh.format) as fmt:
+            for i in range(5):
+                test_logger.info("message %d", i)
+        assert fmt.call_count == 5
+        assert (tmp_path / "test.log.1").exists()
+        assert "message 4" in log_file.read_text()
+
+    def test_rollover_works_with_delayed_open(self, tmp_path: Path):
+        log_file = tmp_path / "test.log"
+        fh = RotatingFileHandler(log_file, maxBytes=32, backupCount=1, delay=True, encoding="utf-8")
+        try:
+            for i in range(3):
+                fh.emit(logging.makeLogRecord({"msg": f"delayed message {i}"}))
+        finally:
+            fh.close()
+        assert (tmp_path / "test.log.1").exists()
+
+    def test_rollover_sees_bytes_appended_by_other_writers(self, tmp_path: Path):
+        log_file = tmp_path / "test.log"
+        fh = RotatingFileHandler(log_file, maxBytes=64, backupCount=1, encoding="utf-8")
+        try:
+            fh.emit(logging.makeLogRecord({"msg": "first"}))
+            with open(log_file, "a", encoding="utf-8") as other:
+                other.write("x" * 100 + "\n")
+            fh.emit(logging.makeLogRecord({"msg": "second"}))
+        finally:
+            fh.close()
+        assert "x" * 100 in (tmp_path / "test.log.1").read_text()
+        assert log_file.read_text() == "second\n"
@@ -133,11 +133,16 @@ def _build_fake_langfuse_module() -> types.ModuleType:
     mod = types.ModuleType("langfuse")
     mod.instances = []
     mod.propagate_calls = []
+    mod.open_propagations = 0
 
     @contextmanager
     def propagate_attributes(**kwargs: object):
         mod.propagate_calls.append(dict(kwargs))
-        yield
+        mod.open_propagations += 1
+        try:
+            yield
+        finally:
+            mod.open_propagations -= 1
 
     class Langfuse:
         def __init__(self, public_key: str, secret_key: str, host: str) -> None:
@@ -289,6 +294,22 @@ class ProviderContractTest(unittest.TestCase):
         self.assertTrue(client.shutdown_called)
         self.assertEqual(len(fake_langfuse.propagate_calls), 2)
 
+    def test_langfuse_provider_scopes_propagation_to_each_turn(self) -> None:
+        fake_langfuse = _build_fake_langfuse_module()
+        with _patch_modules({"langfuse": fake_langfuse}):
+            mod = _import_fresh("otel_hooks.providers.langfuse")
+            provider = mod.LangfuseProvider("pk", "sk", "https://lf")
+            provider.emit_turn("s1", 1, _sample_turn(), Path("/tmp/t.jsonl"), "claude")
+            self.assertEqual(fake_langfuse.open_propagations, 0)
+            provider.emit_turn("s1", 2, _sample_turn(), Path("/tmp/t.jsonl"), "claude")
+            self.assertEqual(fake_langfuse.open_propagations, 0)
+
+        self.assertEqual(
+            [c["trace_name"] for c in fake_langfuse.propagate_calls],
+            ["claude - Turn 1", "claude - Turn 2"],
+        )
+        self.assertTrue(all(c["session_id"] == "s1" for c in fake_langfuse.propagate_calls))
+
     def test_otlp_provider_emits_expected_span_shape(self) -> None:
         fake_modules = _build_fake_otlp_modules()
         with _patch_modules(fake_modules):
@@ -2,11 +2,20 @@ from __future__ import annotations
 
 import tests._path_setup  # noqa: F401
 
+import hashlib
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from otel_hooks.runtime.state import SessionState, read_new_jsonl_lines
+from otel_hooks.runtime.state import (
+    SessionState,
+    load_state,
+    migrate_legacy_state_key,
+    read_new_jsonl_lines,
+    save_state,
+    state_key,
+)
 
 
 class RuntimeStateTest(unittest.TestCase):
@@ -25,6 +34,26 @@ class RuntimeStateTest(unittest.TestCase):
             self.assertEqual(lines2, ['{"b":2}', '{"c":3}'])
             self.assertEqual(ss.buffer, "")
 
+    def test_read_new_jsonl_lines_carries_partial_line_across_reads(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "t.jsonl"
+            path.write_text('{"t":"あ', encoding="utf-8")
+
+            ss = SessionState(offset=0, buffer="", turn_count=0)
+            lines, ss = read_new_jsonl_lines(path, ss)
+            self.assertEqual(lines, [])
+            self.assertEqual(ss.buffer, '{"t":"あ')
+
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('い"}\n\n')
+            lines, ss = read_new_jsonl_lines(path, ss)
+            self.assertEqual(lines, ['{"t":"あい"}', ""])
+            self.assertEqual(ss.buffer, "")
+            self.assertEqual(ss.offset, path.stat().st_size)
+
+            lines, ss = read_new_jsonl_lines(path, ss)
+            self.assertEqual(lines, [])
+
     def test_read_new_jsonl_lines_returns_empty_for_missing_file(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             path = Path(td) / "missing.jsonl"
@@ -33,6 +62,28 @@ class RuntimeStateTest(unittest.TestCase):
             self.assertEqual(lines, [])
             self.assertEqual(ss2.offset, 0)
 
+    def test_load_state_returns_empty_for_missing_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            self.assertEqual(load_state(Path(td) / "state.json"), {})
+
+    def test_save_state_round_trips_compact_json_without_orjson(self) -> None:
+        state = {"k": {"offset": 3, "buffer": "あ", "turn_count": 1}}
+        with tempfile.TemporaryDirectory() as td, patch("otel_hooks.json_codec.orjson", None):
+            path = Path(td) / "state.json"
+            save_state(state, path)
+            self.assertEqual(path.read_bytes(), '{"k":{"offset":3,"buffer":"あ","turn_count":1}}'.encode("utf-8"))
+            self.assertEqual(load_state(path), state)
+
+    def test_migrate_legacy_state_key_moves_sha256_entry(self) -> None:
+        legacy = hashlib.sha256(b"s-1::/tmp/t.jsonl").hexdigest()
+        state = {legacy: {"offset": 42, "buffer": "", "turn_count": 3}}
+        key = state_key("s-1", "/tmp/t.jsonl")
+
+        migrate_legacy_state_key(state, key, "s-1", "/tmp/t.jsonl")
+
+        self.assertEqual(state, {key: {"offset": 42, "buffer": "", "turn_count": 3}})
+        self.assertEqual(len(key), 32)
+
 
 if __name__ == "__main__":
     unittest.main()
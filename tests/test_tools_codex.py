@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import base64
+import tempfile
 import tests._path_setup  # noqa: F401
 import unittest
+from pathlib import Path
 
 from otel_hooks.tools import get_tool
 
@@ -37,5 +39,22 @@ class CodexConfigGenerationTest(unittest.TestCase):
         self.assertEqual(exporter["headers"]["Authorization"], expected_auth)
 
 
+class CodexTomlReadTest(unittest.TestCase):
+    def test_read_toml_reflects_file_on_disk(self) -> None:
+        from otel_hooks.tools import codex
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.toml"
+            self.assertEqual(codex._read_toml(path), {})
+
+            codex._write_toml({"model": "o3"}, path)
+            first = codex._read_toml(path)
+            first["model"] = "mutated"
+            self.assertEqual(codex._read_toml(path), {"model": "o3"})
+
+            codex._write_toml({"model": "gpt-5"}, path)
+            self.assertEqual(codex._read_toml(path), {"model": "gpt-5"})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -36,6 +36,18 @@ class ToolHookIdempotencyTest(unittest.TestCase):
     def test_cline_register_unregister_is_idempotent(self) -> None:
         self._assert_idempotent(get_tool("cline"), HOOK_COMMAND)
 
+    def test_claude_unregister_keeps_foreign_groups_in_place(self) -> None:
+        cfg = get_tool("claude")
+        foreign = {"hooks": [{"type": "command", "command": "other-tool"}]}
+        settings = cfg.register_hook({"hooks": {"Stop": [foreign]}})
+        stop = settings["hooks"]["Stop"]
+
+        settings = cfg.unregister_hook(settings)
+
+        self.assertIs(settings["hooks"]["Stop"], stop)
+        self.assertEqual(stop, [foreign])
+        self.assertFalse(cfg.is_hook_registered(settings))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,8 +8,8 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from otel_hooks import config
-from otel_hooks.tools import Scope, available_tools, get_tool
+from otel_hooks import config, file_io
+from otel_hooks.tools import Scope, available_tools, get_tool, json_io
 
 
 class ToolsRegistryAndConfigTest(unittest.TestCase):
@@ -28,6 +28,11 @@ class ToolsRegistryAndConfigTest(unittest.TestCase):
         self.assertEqual(claude.name, "claude")
         self.assertIn(Scope.GLOBAL, claude.scopes())
 
+    def test_get_tool_returns_shared_instance(self) -> None:
+        self.assertIs(get_tool("cursor"), get_tool("cursor"))
+        with self.assertRaises(ValueError):
+            get_tool("vim")
+
     def test_load_raw_config_reads_single_scope_without_merge(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -45,6 +50,19 @@ class ToolsRegistryAndConfigTest(unittest.TestCase):
             self.assertEqual(project_cfg["provider"], "otlp")
             self.assertEqual(global_cfg["provider"], "langfuse")
 
+    def test_load_raw_config_reflects_disk_not_caller_mutations(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / ".otel-hooks.json").write_text('{"provider": "otlp"}', encoding="utf-8")
+
+            with patch("otel_hooks.config.Path.cwd", return_value=root):
+                first = config.load_raw_config(Scope.PROJECT)
+                first["provider"] = "mutated"
+                self.assertEqual(config.load_raw_config(Scope.PROJECT), {"provider": "otlp"})
+
+                config.save_config({"provider": "datadog"}, Scope.PROJECT)
+                self.assertEqual(config.load_raw_config(Scope.PROJECT), {"provider": "datadog"})
+
     def test_load_config_applies_env_override_last(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -80,6 +98,79 @@ class ToolsRegistryAndConfigTest(unittest.TestCase):
             self.assertEqual(merged["langfuse"]["public_key"], "pk")
             self.assertEqual(merged["otlp"]["endpoint"], "http://localhost:4318")
 
+    def test_load_config_reflects_disk_and_env_on_every_call(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / ".otel-hooks.json").write_text('{"otlp": {"headers": "a=1"}}', encoding="utf-8")
+
+            with patch("otel_hooks.config.Path.cwd", return_value=root), patch(
+                "otel_hooks.config.Path.home", return_value=root
+            ):
+                first = config.load_config()
+                first["otlp"]["headers"] = "mutated"
+                with patch.dict(os.environ, {"OTEL_EXPORTER_OTLP_ENDPOINT": "http://c:4318"}, clear=False):
+                    second = config.load_config()
+                self.assertEqual(second["otlp"], {"headers": "a=1", "endpoint": "http://c:4318"})
+
+                config.save_config({"otlp": {"headers": "b=2"}}, Scope.PROJECT)
+                self.assertEqual(config.load_config()["otlp"]["headers"], "b=2")
+
+    def test_env_keys_for_provider_returns_shared_immutable_pairs(self) -> None:
+        keys = config.env_keys_for_provider("otlp")
+        self.assertIs(config.env_keys_for_provider("otlp"), keys)
+        self.assertEqual(
+            keys,
+            (
+                config.ProviderKey("endpoint", "OTEL_EXPORTER_OTLP_ENDPOINT"),
+                config.ProviderKey("headers", "OTEL_EXPORTER_OTLP_HEADERS"),
+            ),
+        )
+        self.assertEqual(config.env_keys_for_provider("unknown"), ())
+
+    def test_only_langfuse_secret_key_is_marked_secret(self) -> None:
+        secret = [k.env_var for p in ("langfuse", "otlp", "datadog") for k in config.env_keys_for_provider(p) if k.secret]
+        self.assertEqual(secret, ["LANGFUSE_SECRET_KEY"])
+
+    def test_load_json_returns_fresh_dict_and_default_for_missing_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "settings.json"
+            default = {"version": 1, "hooks": {}}
+            self.assertEqual(json_io.load_json(path, default=default), default)
+
+            json_io.save_json(path, {"hooks": {}})
+            first = json_io.load_json(path)
+            first["hooks"]["Stop"] = []
+            self.assertEqual(json_io.load_json(path), {"hooks": {}})
+
+            json_io.save_json(path, {"hooks": {"Stop": []}})
+            self.assertEqual(json_io.load_json(path), {"hooks": {"Stop": []}})
+
+    def test_save_config_writes_indented_json_without_orjson(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / ".otel-hooks.json"
+            with patch("otel_hooks.config.config_path", return_value=path), patch(
+                "otel_hooks.json_codec.orjson", None
+            ):
+                config.save_config({"otlp": {"endpoint": "http://ü"}}, Scope.PROJECT)
+                self.assertEqual(config.load_raw_config(Scope.PROJECT), {"otlp": {"endpoint": "http://ü"}})
+
+            self.assertEqual(
+                path.read_text(encoding="utf-8"),
+                '{\n  "otlp": {\n    "endpoint": "http://ü"\n  }\n}\n',
+            )
+
+    def test_atomic_write_fsyncs_file_and_parent_dir_only_when_durable(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "sub" / "settings.json"
+            with patch("otel_hooks.file_io.os.fsync", wraps=os.fsync) as fsync:
+                file_io.atomic_write(path, b"{}\n")
+                self.assertEqual(fsync.call_count, 0)
+                file_io.atomic_write(path, b"[]\n", durable=True)
+                self.assertEqual(fsync.call_count, 2)
+
+            self.assertEqual(path.read_bytes(), b"[]\n")
+            self.assertEqual(path.stat().st_mode & 0o777, 0o600)
+            self.assertFalse(path.with_suffix(".tmp").exists())
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,7 @@ import tests._path_setup  # noqa: F401
 
 import hashlib
 import unittest
+from unittest.mock import patch
 
 from otel_hooks.domain import transcript
 
@@ -78,11 +79,35 @@ class TranscriptDomainTest(unittest.TestCase):
         assistant_text = transcript.extract_text(transcript.get_content(turns[0].assistant_msgs[0]))
         self.assertEqual(assistant_text, "final answer")
 
+    def test_message_fields_matches_individual_accessors(self) -> None:
+        msgs = [
+            {"type": "user", "message": {"role": "user", "content": "hi"}},
+            {"type": "summary", "message": {"role": "assistant", "content": [{"type": "text"}]}},
+            {"type": "system", "message": {"role": "system", "content": "x"}},
+            {"type": "assistant", "content": "flat"},
+            {"type": "assistant", "message": {"id": "m1", "content": []}},
+            {"type": "assistant", "message": {"id": 7, "content": []}},
+            {"message": "not-a-dict", "content": "fallback"},
+            {},
+        ]
+        for msg in msgs:
+            with self.subTest(msg=msg):
+                self.assertEqual(
+                    transcript._message_fields(msg),
+                    (transcript.get_role(msg), transcript.get_content(msg), transcript.get_message_id(msg)),
+                )
+
     def test_decode_jsonl_lines_skips_invalid_json(self) -> None:
-        lines = ['{"type":"user"}', "", "not-json", '{"type":"assistant"}']
+        lines = ['{"type":"user"}', "", "  ", "not-json", '{"type":"assistant"}\r']
         parsed = transcript.decode_jsonl_lines(lines)
         self.assertEqual(parsed, [{"type": "user"}, {"type": "assistant"}])
 
+    def test_decode_jsonl_lines_without_orjson_uses_stdlib(self) -> None:
+        lines = ['{"type":"user"}', "not-json"]
+        with patch("otel_hooks.json_codec.orjson", None):
+            parsed = transcript.decode_jsonl_lines(lines)
+        self.assertEqual(parsed, [{"type": "user"}])
+
     def test_truncate_text_returns_hash_metadata(self) -> None:
         raw = "abcdef"
         truncated, meta = transcript.truncate_text(raw, max_chars=3)
@@ -92,6 +117,14 @@ class TranscriptDomainTest(unittest.TestCase):
         self.assertEqual(meta["kept_len"], 3)
         self.assertEqual(meta["sha256"], hashlib.sha256(raw.encode("utf-8")).hexdigest())
 
+    def test_truncate_text_reuses_digest_for_repeated_text(self) -> None:
+        raw = "x" * 50
+        transcript._sha256_hex.cache_clear()
+        _, first = transcript.truncate_text(raw, max_chars=10)
+        _, second = transcript.truncate_text("".join(["x" * 25, "x" * 25]), max_chars=5)
+        self.assertEqual(first["sha256"], second["sha256"])
+        self.assertEqual(transcript._sha256_hex.cache_info().hits, 1)
+
 
 if __name__ == "__main__":
     unittest.main()